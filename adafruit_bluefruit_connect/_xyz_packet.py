@@ -14,16 +14,15 @@ Bluefruit Connect App superclass for all data packets with (x, y, z) values
 
 from __future__ import annotations
 
-import struct
-
 from .packet import Packet
 
 
 class _XYZPacket(Packet):
     """A packet of x, y, z float values. Used for several different Bluefruit controller packets."""
 
+    __slots__ = ("_x", "_y", "_z")
+
     _FMT_PARSE: str = "<xxfffx"
-    PACKET_LENGTH: int = struct.calcsize(_FMT_PARSE)
     # _FMT_CONSTRUCT doesn't include the trailing checksum byte.
     _FMT_CONSTRUCT: str = "<2sfff"
     # _TYPE_HEADER is set by each concrete subclass.
@@ -35,12 +34,20 @@ class _XYZPacket(Packet):
         self._y = y
         self._z = z
 
-    def to_bytes(self) -> bytes:
-        """Return the bytes needed to send this packet."""
-        partial_packet = struct.pack(
-            self._FMT_CONSTRUCT, self._TYPE_HEADER, self._x, self._y, self._z
+    def _load(self, packet: bytes, offset: int = 0) -> None:
+        self._x, self._y, self._z = self._unpack(packet, offset)
+
+    def _values(self) -> tuple:
+        return self._x, self._y, self._z
+
+    def to_bytes_into(self, buffer: bytearray, offset: int = 0) -> int:
+        """Write the bytes needed to send this packet into ``buffer``, starting at ``offset``.
+        Return the offset just past the packet.
+        """
+        self._pack_into(
+            self._STRUCT_CONSTRUCT, buffer, offset, self._TYPE_HEADER, self._x, self._y, self._z
         )
-        return self.add_checksum(partial_packet)
+        return self._add_checksum_into(buffer, offset)
 
     @property
     def x(self) -> float:
@@ -21,6 +21,7 @@ class AccelerometerPacket(_XYZPacket):
     """A packet of x, y, z float values from an accelerometer."""
 
     # Everything else is handled by _XYZPacket.
+    __slots__ = ()
     _TYPE_HEADER: bytes = b"!A"
 
 
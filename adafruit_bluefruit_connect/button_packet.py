@@ -15,15 +15,8 @@ Bluefruit Connect App Button data packet (button_name, pressed/released)
 
 from __future__ import annotations
 
-import struct
-
 from .packet import Packet
 
-try:
-    from typing import Optional  # adjust these as needed
-except ImportError:
-    pass
-
 
 class ButtonPacket(Packet):
     """A packet containing a button name and its state."""
@@ -45,8 +38,9 @@ class ButtonPacket(Packet):
     RIGHT: str = "8"
     """Right Button."""
 
+    __slots__ = ("_button", "_pressed")
+
     _FMT_PARSE: str = "<xxssx"
-    PACKET_LENGTH: int = struct.calcsize(_FMT_PARSE)
     # _FMT_CONSTRUCT doesn't include the trailing checksum byte.
     _FMT_CONSTRUCT: str = "<2sss"
     _TYPE_HEADER: bytes = b"!B"
@@ -58,36 +52,41 @@ class ButtonPacket(Packet):
         :param bool pressed: ``True`` if button is pressed; ``False`` if it is
                              released.
         """
-        # This check will catch wrong length and also non-sequence args (like an int).
-        try:
-            assert len(button) == 1
-            assert isinstance(button, str)
-        except Exception as err:
-            raise ValueError("Button must be a single char.") from err
+        if not isinstance(button, str) or len(button) != 1:
+            raise ValueError("Button must be a single char.")
 
         self._button: str = button
         self._pressed: bool = pressed
 
     @classmethod
-    def parse_private(cls, packet: bytes) -> Optional[Packet]:
-        """Construct a ButtonPacket from an incoming packet.
-        Do not call this directly; call Packet.from_bytes() instead.
-        pylint makes it difficult to call this method _parse(), hence the name.
+    def _unpack(cls, packet: bytes, offset: int = 0) -> tuple:
+        """Return the button name and pressed state of the packet starting at ``packet[offset]``.
+        Validates the pressed state. Do not call this directly; call Packet.from_bytes() instead.
         """
-        button, pressed = struct.unpack(cls._FMT_PARSE, packet)
+        button, pressed = cls._unpack_from(cls._STRUCT_PARSE, packet, offset)
         if not pressed in b"01":
             raise ValueError("Bad button press/release value")
-        return cls(chr(button[0]), pressed == b"1")
+        return chr(button[0]), pressed == b"1"
 
-    def to_bytes(self) -> bytes:
-        """Return the bytes needed to send this packet."""
-        partial_packet: bytes = struct.pack(
-            self._FMT_CONSTRUCT,
+    def _load(self, packet: bytes, offset: int = 0) -> None:
+        self._button, self._pressed = self._unpack(packet, offset)
+
+    def _values(self) -> tuple:
+        return self._button, self._pressed
+
+    def to_bytes_into(self, buffer: bytearray, offset: int = 0) -> int:
+        """Write the bytes needed to send this packet into ``buffer``, starting at ``offset``.
+        Return the offset just past the packet.
+        """
+        self._pack_into(
+            self._STRUCT_CONSTRUCT,
+            buffer,
+            offset,
             self._TYPE_HEADER,
             bytes(self._button, "utf-8"),
             b"1" if self._pressed else b"0",
         )
-        return self.add_checksum(partial_packet)
+        return self._add_checksum_into(buffer, offset)
 
     @property
     def button(self) -> str:
@@ -0,0 +1,322 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_bluefruit_connect.capture`
+====================================================
+
+Record the data received from the Bluefruit Connect App, with timestamps,
+and replay it later as a stream.
+
+A capture file starts with the 4-byte magic number ``b"BFCC"`` and a one-byte
+format version. It is followed by one record for each chunk of data read:
+
+  - *timestamp* - a little-endian double: ``time.monotonic()`` when the chunk was read.
+  - *length* - a little-endian unsigned 32-bit int: the number of data bytes.
+  - *data ...* - the bytes that were read.
+
+Recording works anywhere. Reading a capture uses ``mmap``, so it is only
+available on a host computer.
+
+* Author(s): Adafruit Industries
+
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+from bisect import bisect_right
+from struct import calcsize, pack, unpack_from
+
+try:
+    import mmap
+except ImportError:
+    # Not available on CircuitPython. CaptureReader cannot be used there.
+    mmap = None
+
+try:
+    from io import RawIOBase
+    from typing import Any, Iterator, Optional, Tuple  # adjust these as needed
+except ImportError:
+    pass
+
+_MAGIC = b"BFCC"
+_VERSION = 1
+_FILE_HEADER = "<4sB"
+_FILE_HEADER_SIZE = calcsize(_FILE_HEADER)
+_RECORD_HEADER = "<dI"
+_RECORD_HEADER_SIZE = calcsize(_RECORD_HEADER)
+
+
+class CaptureWriter:
+    """Write chunks of received data to a capture file.
+
+    :param file: a file opened for writing in binary mode. The caller is
+      responsible for closing it.
+    """
+
+    def __init__(self, file: Any) -> None:
+        self._file = file
+        file.write(pack(_FILE_HEADER, _MAGIC, _VERSION))
+
+    def write_chunk(self, data: bytes, timestamp: Optional[float] = None) -> None:
+        """Record one chunk of received data. Empty chunks are not recorded.
+
+        :param data: the bytes that were read
+        :param float timestamp: when the data was read. Defaults to ``time.monotonic()``.
+        """
+        if not data:
+            return
+        if timestamp is None:
+            timestamp = time.monotonic()
+        self._file.write(pack(_RECORD_HEADER, timestamp, len(data)))
+        self._file.write(data)
+
+
+class RecordingStream:
+    """Wrap an input stream, and record everything read from it with a `CaptureWriter`.
+    It can be passed to ``Packet.from_stream()`` or `PacketReader` in place of the
+    stream it wraps.
+
+    :param stream stream: the stream to read from, such as ``ble.UARTServer`` or
+      ``busio.UART``.
+    :param CaptureWriter writer: where to record the data read.
+    """
+
+    def __init__(self, stream: RawIOBase, writer: CaptureWriter) -> None:
+        self._stream = stream
+        self._writer = writer
+
+    @property
+    def in_waiting(self) -> int:
+        """The number of bytes waiting in the wrapped stream."""
+        return self._stream.in_waiting
+
+    def read(self, nbytes: Optional[int] = None) -> Optional[bytes]:
+        """Read from the wrapped stream, and record the data read."""
+        data = self._stream.read() if nbytes is None else self._stream.read(nbytes)
+        self._writer.write_chunk(data)
+        return data
+
+    def readinto(self, buf: bytearray, nbytes: Optional[int] = None) -> Optional[int]:
+        """Read into ``buf`` from the wrapped stream, and record the data read."""
+        if nbytes is None:
+            count = self._stream.readinto(buf)
+        else:
+            count = self._stream.readinto(buf, nbytes)
+        if count:
+            self._writer.write_chunk(memoryview(buf)[0:count])
+        return count
+
+    def readline(self) -> Optional[bytes]:
+        """Read a line from the wrapped stream, and record the data read."""
+        data = self._stream.readline()
+        self._writer.write_chunk(data)
+        return data
+
+    def write(self, buf: bytes) -> Optional[int]:
+        """Write to the wrapped stream. Written data is not recorded."""
+        return self._stream.write(buf)
+
+
+class CaptureReader:
+    """Random access to the records of a capture file, which is memory-mapped
+    rather than read into memory. An index of the records is built when the file
+    is opened. A final record that was only partly written is ignored.
+
+    ``len(reader)`` is the number of records, and ``reader[i]`` is
+    ``(timestamp, data)`` for record ``i``.
+
+    :param str path: the capture file to read.
+    """
+
+    def __init__(self, path: str) -> None:
+        if mmap is None:
+            raise RuntimeError("CaptureReader requires mmap")
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be mapped.
+            self._file.close()
+            raise ValueError("Not a capture file") from None
+
+        data = self._mmap
+        if len(data) < _FILE_HEADER_SIZE or unpack_from(_FILE_HEADER, data, 0) != (
+            _MAGIC,
+            _VERSION,
+        ):
+            self.close()
+            raise ValueError("Not a capture file")
+
+        # The index: the timestamp, data offset, and length of each record.
+        self._timestamps = array("d")
+        self._offsets = array("Q")
+        self._lengths = array("L")
+        offset = _FILE_HEADER_SIZE
+        while offset + _RECORD_HEADER_SIZE <= len(data):
+            timestamp, length = unpack_from(_RECORD_HEADER, data, offset)
+            offset += _RECORD_HEADER_SIZE
+            if offset + length > len(data):
+                break
+            self._timestamps.append(timestamp)
+            self._offsets.append(offset)
+            self._lengths.append(length)
+            offset += length
+
+    def close(self) -> None:
+        """Close the capture file."""
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> CaptureReader:
+        return self
+
+    def __exit__(self, exception_type: Any, exception_value: Any, traceback: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: int) -> Tuple[float, bytes]:
+        offset = self._offsets[index]
+        return self._timestamps[index], self._mmap[offset : offset + self._lengths[index]]
+
+    def __iter__(self) -> Iterator[Tuple[float, bytes]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def timestamp(self, index: int) -> float:
+        """The timestamp of record ``index``."""
+        return self._timestamps[index]
+
+    def index_at(self, timestamp: float) -> int:
+        """Return the index of the last record read at or before ``timestamp``,
+        or -1 if there is none.
+        """
+        return bisect_right(self._timestamps, timestamp) - 1
+
+    def replay(self, realtime: bool = False, start: int = 0) -> ReplayStream:
+        """Return a `ReplayStream` that replays the recorded data.
+
+        :param bool realtime: if ``True``, each chunk becomes available at the same time
+          relative to the start of the replay as it was received. If ``False``, all the
+          data is available at once, to replay as fast as possible.
+        :param int start: the index of the first record to replay.
+        """
+        return ReplayStream(self, realtime, start)
+
+
+class ReplayStream:
+    """A stream that returns the data recorded in a capture, for use in place of
+    ``busio.UART`` or ``ble.UARTServer`` with ``Packet.from_stream()`` or `PacketReader`.
+    Create one with `CaptureReader.replay()`.
+
+    As with a UART, reads wait until data is available. Once all the data has been
+    read, ``read()`` returns None.
+    """
+
+    def __init__(self, capture: CaptureReader, realtime: bool, start: int) -> None:
+        self._capture = capture
+        self._realtime = realtime
+        # Records before self._next have been made available to read.
+        self._next = start
+        # Number of bytes available to read.
+        self._waiting = 0
+        # The record being read, and the position and end in the file of its unread data.
+        self._record = start
+        self._position = 0
+        self._record_end = 0
+        self._start_time = time.monotonic()
+        self._first_timestamp = capture.timestamp(start) if start < len(capture) else 0.0
+
+    def _release(self) -> None:
+        """Make the records that are due available to read."""
+        capture = self._capture
+        count = len(capture)
+        if self._realtime:
+            due = time.monotonic() - self._start_time + self._first_timestamp
+        else:
+            due = None
+        while self._next < count and (due is None or capture._timestamps[self._next] <= due):
+            self._waiting += capture._lengths[self._next]
+            self._next += 1
+
+    def _wait(self) -> bool:
+        """Make data available to read, waiting for the next record if necessary.
+        Return False if all the data has been read.
+        """
+        self._release()
+        if self._waiting:
+            return True
+        if self._next >= len(self._capture):
+            return False
+        delay = self._capture._timestamps[self._next] - self._first_timestamp
+        delay -= time.monotonic() - self._start_time
+        if delay > 0:
+            time.sleep(delay)
+        self._waiting += self._capture._lengths[self._next]
+        self._next += 1
+        return True
+
+    def _unread_record(self) -> None:
+        """Move to the next record with unread data, if the current one has all been read."""
+        while self._position >= self._record_end:
+            if self._record_end:
+                self._record += 1
+            self._position = self._capture._offsets[self._record]
+            self._record_end = self._position + self._capture._lengths[self._record]
+
+    @property
+    def in_waiting(self) -> int:
+        """The number of bytes available to read without waiting."""
+        self._release()
+        return self._waiting
+
+    def readinto(self, buf: bytearray, nbytes: Optional[int] = None) -> Optional[int]:
+        """Read bytes into ``buf``. Return the number of bytes read, or None
+        if all the data has been read.
+        """
+        if not self._wait():
+            return None
+        view = memoryview(buf)
+        count = min(len(view) if nbytes is None else nbytes, self._waiting)
+        data = self._capture._mmap
+        copied = 0
+        while copied < count:
+            self._unread_record()
+            take = min(count - copied, self._record_end - self._position)
+            view[copied : copied + take] = data[self._position : self._position + take]
+            self._position += take
+            copied += take
+        self._waiting -= count
+        return count
+
+    def read(self, nbytes: Optional[int] = None) -> Optional[bytes]:
+        """Read ``nbytes`` bytes, or as many as are available if fewer or if ``nbytes``
+        is None. Return None if all the data has been read.
+        """
+        if not self._wait():
+            return None
+        buf = bytearray(self._waiting if nbytes is None else min(nbytes, self._waiting))
+        self.readinto(buf)
+        return bytes(buf)
+
+    def readline(self) -> Optional[bytes]:
+        """Read a line, up to and including a newline, or up to the end of the data.
+        Return None if all the data has been read.
+        """
+        line = bytearray()
+        data = self._capture._mmap
+        while self._wait():
+            self._unread_record()
+            newline = data.find(b"\n", self._position, self._record_end)
+            end = self._record_end if newline < 0 else newline + 1
+            line.extend(data[self._position : end])
+            self._waiting -= end - self._position
+            self._position = end
+            if newline >= 0:
+                break
+        return bytes(line) if line else None
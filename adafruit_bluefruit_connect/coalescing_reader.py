@@ -0,0 +1,95 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_bluefruit_connect.coalescing_reader`
+====================================================
+
+Keep only the newest sample of high-rate sensor packets, while still delivering
+every discrete event, such as a button press, in order.
+
+* Author(s): Adafruit Industries
+
+"""
+
+from __future__ import annotations
+
+from ._xyz_packet import _XYZPacket
+
+try:
+    from typing import Iterable, List, Optional  # adjust these as needed
+
+    from .packet import Packet
+    from .packet_reader import PacketReader
+except ImportError:
+    pass
+
+
+class CoalescingReader:
+    """Drain all the packets available from a `PacketReader` at once, and keep only
+    the newest packet of each coalesced type. Other packets, such as ``ButtonPacket``
+    and ``ColorPacket``, are returned in the order they arrived.
+
+    When the app streams sensor data faster than the program handles it, this lets
+    the program act on the current motion instead of working through a backlog of
+    stale samples.
+
+    :param PacketReader reader: where to read packets from. It must not reuse packet
+      objects, or events returned together would be the same object.
+    :param coalesced_types: the packet classes to coalesce. By default, the
+      accelerometer, gyro, magnetometer, and quaternion packets are coalesced.
+    """
+
+    def __init__(self, reader: PacketReader, coalesced_types: Optional[Iterable] = None) -> None:
+        self._reader = reader
+        if coalesced_types is None:
+            self._coalesced = None
+        else:
+            self._coalesced = {packet_class._TYPE_HEADER for packet_class in coalesced_types}
+        # Newest packet of each coalesced type not yet taken with pop_latest(), by header.
+        self._pending = {}
+        # Newest packet of each coalesced type, by header.
+        self._latest = {}
+        self._events = []
+        self.dropped = 0
+        """Number of coalesced packets replaced by a newer packet before being taken
+        with `pop_latest()`."""
+
+    def _is_coalesced(self, packet: Packet) -> bool:
+        if self._coalesced is None:
+            return isinstance(packet, _XYZPacket)
+        return packet._TYPE_HEADER in self._coalesced
+
+    def poll(self) -> List[Packet]:
+        """Read all the packets available now. Return the packets that are not coalesced,
+        in the order they arrived. The returned list is reused by the next call
+        to ``poll()``.
+        """
+        events = self._events
+        events.clear()
+        pending = self._pending
+        while True:
+            packet = self._reader.read_packet()
+            if packet is None:
+                return events
+            if self._is_coalesced(packet):
+                header = packet._TYPE_HEADER
+                if header in pending:
+                    self.dropped += 1
+                pending[header] = packet
+                self._latest[header] = packet
+            else:
+                events.append(packet)
+
+    def pop_latest(self, packet_class: type) -> Optional[Packet]:
+        """Return the newest packet of type ``packet_class`` received since the last call,
+        or None if no new packet of that type has arrived.
+        """
+        return self._pending.pop(packet_class._TYPE_HEADER, None)
+
+    def latest(self, packet_class: type) -> Optional[Packet]:
+        """Return the newest packet of type ``packet_class`` ever received, whether or not
+        it has been taken with `pop_latest()`, or None if none has arrived.
+        """
+        return self._latest.get(packet_class._TYPE_HEADER, None)
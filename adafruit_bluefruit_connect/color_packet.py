@@ -14,8 +14,6 @@ Bluefruit Connect App color data packet.
 
 from __future__ import annotations
 
-import struct
-
 from .packet import Packet
 
 try:
@@ -27,8 +25,9 @@ except ImportError:
 class ColorPacket(Packet):
     """A packet containing an RGB color value."""
 
+    __slots__ = ("_color",)
+
     _FMT_PARSE: str = "<xx3Bx"
-    PACKET_LENGTH: int = struct.calcsize(_FMT_PARSE)
     # _FMT_CONSTRUCT doesn't include the trailing checksum byte.
     _FMT_CONSTRUCT: str = "<2s3B"
     _TYPE_HEADER: bytes = b"!C"
@@ -48,17 +47,25 @@ class ColorPacket(Packet):
             raise ValueError("Color must be an integer 0xRRGGBB or a tuple(r,g,b)")
 
     @classmethod
-    def parse_private(cls, packet: bytes) -> Optional[Packet]:
-        """Construct a ColorPacket from an incoming packet.
+    def parse_private(cls, packet: bytes, offset: int = 0) -> Optional[Packet]:
+        """Construct a ColorPacket from an incoming packet starting at ``packet[offset]``.
         Do not call this directly; call Packet.from_bytes() instead.
         pylint makes it difficult to call this method _parse(), hence the name.
         """
-        return cls(struct.unpack(cls._FMT_PARSE, packet))
+        return cls(cls._unpack(packet, offset))
+
+    def _load(self, packet: bytes, offset: int = 0) -> None:
+        self._color = self._unpack(packet, offset)
 
-    def to_bytes(self) -> bytes:
-        """Return the bytes needed to send this packet."""
-        partial_packet = struct.pack(self._FMT_CONSTRUCT, self._TYPE_HEADER, *self._color)
-        return self.add_checksum(partial_packet)
+    def _values(self) -> tuple:
+        return tuple(self._color)
+
+    def to_bytes_into(self, buffer: bytearray, offset: int = 0) -> int:
+        """Write the bytes needed to send this packet into ``buffer``, starting at ``offset``.
+        Return the offset just past the packet.
+        """
+        self._pack_into(self._STRUCT_CONSTRUCT, buffer, offset, self._TYPE_HEADER, *self._color)
+        return self._add_checksum_into(buffer, offset)
 
     @property
     def color(self) -> tuple:
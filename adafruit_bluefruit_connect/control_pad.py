@@ -0,0 +1,119 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_bluefruit_connect.control_pad`
+====================================================
+
+Track which Bluefruit Connect App Control Pad buttons are held down,
+and which were pressed or released since the last frame.
+
+* Author(s): Adafruit Industries
+
+"""
+
+from __future__ import annotations
+
+from .button_packet import ButtonPacket
+
+
+class ControlPadState:
+    """The state of the eight Control Pad buttons, kept as bits of one integer.
+    Button ``"1"`` is bit 0 and ``ButtonPacket.RIGHT`` (``"8"``) is bit 7.
+
+    Feed it every ``ButtonPacket`` received, with `apply()`, `apply_bytes()`, or
+    `update()`, then call `next_frame()` once at the start of each frame of a game
+    loop. `just_pressed()` and `just_released()` report the changes since the
+    previous frame, so a press and release that both arrive within one frame
+    are still seen::
+
+        pad = ControlPadState()
+        dispatcher.register(ButtonPacket, pad.update, raw=True)
+
+        while True:
+            dispatcher.poll(reader)
+            pad.next_frame()
+            if pad.just_pressed(ButtonPacket.BUTTON_1):
+                fire()
+            if pad.is_pressed(ButtonPacket.LEFT):
+                x -= 1
+    """
+
+    def __init__(self) -> None:
+        self.state = 0
+        """The buttons held down, one bit per button."""
+        # Buttons pressed and released since the last next_frame().
+        self._pressed_since = 0
+        self._released_since = 0
+        self.pressed_mask = 0
+        """The buttons pressed between the last two calls to `next_frame()`."""
+        self.released_mask = 0
+        """The buttons released between the last two calls to `next_frame()`."""
+
+    def update(self, button: str, pressed: bool) -> None:
+        """Record that ``button``, such as ``ButtonPacket.UP``, was pressed or released.
+        It takes the values of a ``ButtonPacket``, so it can be registered as a raw
+        handler with a `Dispatcher`.
+        """
+        self._update_bit(self._bit(button), pressed)
+
+    def apply(self, packet: ButtonPacket) -> None:
+        """Record the press or release in ``packet``."""
+        self._update_bit(self._bit(packet.button), packet.pressed)
+
+    def apply_bytes(self, buffer: bytes, offset: int = 0) -> None:
+        """Record the press or release in the button packet starting at ``buffer[offset]``,
+        without creating a ``ButtonPacket``. The packet is validated as in
+        ``Packet.from_bytes()``.
+        """
+        ButtonPacket._checked_class_at(buffer, offset)
+        button, pressed = ButtonPacket._unpack(buffer, offset)
+        self._update_bit(self._bit(button), pressed)
+
+    @staticmethod
+    def _bit(button: str) -> int:
+        """Return the bit for ``button``, checking that it is one of the eight buttons."""
+        bit = ord(button) - 0x31
+        if not 0 <= bit < 8:
+            raise ValueError("Unknown button")
+        return bit
+
+    def _update_bit(self, bit: int, pressed: bool) -> None:
+        mask = 1 << bit
+        if pressed:
+            if not self.state & mask:
+                self.state |= mask
+                self._pressed_since |= mask
+        elif self.state & mask:
+            self.state &= ~mask
+            self._released_since |= mask
+
+    def next_frame(self) -> None:
+        """Start a new frame. `just_pressed()` and `just_released()` then report the
+        changes recorded since the previous call.
+        """
+        self.pressed_mask = self._pressed_since
+        self.released_mask = self._released_since
+        self._pressed_since = 0
+        self._released_since = 0
+
+    def is_pressed(self, button: str) -> bool:
+        """``True`` if ``button``, such as ``ButtonPacket.BUTTON_1``, is held down."""
+        return bool(self.state >> self._bit(button) & 1)
+
+    def just_pressed(self, button: str) -> bool:
+        """``True`` if ``button`` was pressed in the last frame."""
+        return bool(self.pressed_mask >> self._bit(button) & 1)
+
+    def just_released(self, button: str) -> bool:
+        """``True`` if ``button`` was released in the last frame."""
+        return bool(self.released_mask >> self._bit(button) & 1)
+
+    def reset(self) -> None:
+        """Mark all the buttons as released, and forget any recorded changes."""
+        self.state = 0
+        self._pressed_since = 0
+        self._released_since = 0
+        self.pressed_mask = 0
+        self.released_mask = 0
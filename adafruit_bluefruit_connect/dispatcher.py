@@ -0,0 +1,117 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_bluefruit_connect.dispatcher`
+====================================================
+
+Call a handler function for each packet type, instead of checking the type of
+each packet received with a chain of ``isinstance()`` tests.
+
+* Author(s): Adafruit Industries
+
+"""
+
+from __future__ import annotations
+
+try:
+    from typing import Callable  # adjust these as needed
+
+    from .packet import Packet
+    from .packet_reader import PacketReader
+except ImportError:
+    pass
+
+
+class Dispatcher:
+    """Call the handler registered for each packet's type. Handlers are kept in a
+    table indexed by the type byte of the packet header, such as ``ord("B")`` for
+    ``ButtonPacket``, so finding a handler is a single lookup however many types
+    are registered.
+
+    Use `poll()` to read the packets available from a `PacketReader` and call the
+    handlers as each packet is cut out of the reader's buffer::
+
+        def on_button(packet):
+            print(packet.button, packet.pressed)
+
+        def on_accelerometer(x, y, z):
+            print(x, y, z)
+
+        dispatcher = Dispatcher()
+        dispatcher.register(ButtonPacket, on_button)
+        dispatcher.register(AccelerometerPacket, on_accelerometer, raw=True)
+
+        reader = PacketReader(uart)
+        while True:
+            dispatcher.poll(reader)
+
+    Packets of types with no handler are skipped. When read by `poll()` they are
+    not decoded at all.
+    """
+
+    def __init__(self) -> None:
+        self._handlers = [None] * 256
+        # 1 for the type codes whose handlers take the unpacked field values.
+        self._raw = bytearray(256)
+        self._text_handler = None
+        self._text_raw = False
+
+    def register(self, packet_class: type, handler: Callable, raw: bool = False) -> None:
+        """Call ``handler`` for each packet of type ``packet_class``, replacing any
+        handler already registered for that type. The packet type must also be
+        registered with ``Packet``, as it is when its module has been imported.
+
+        :param type packet_class: the packet class, such as ``ButtonPacket``.
+        :param handler: the function to call. It is passed the packet object, or
+          if ``raw`` is ``True``, the packet's field values as separate arguments,
+          without creating a packet object. The values are the arguments the
+          packet class's constructor takes, except that ``ColorPacket`` values
+          are the red, green, and blue components, and ``RawTextPacket`` values
+          are the ``text`` of the packet as a single argument.
+        :param bool raw: whether ``handler`` takes field values instead of a packet.
+        """
+        header = packet_class._TYPE_HEADER
+        if header == b"RT":
+            self._text_handler = handler
+            self._text_raw = raw
+            return
+        code = header[1]
+        self._handlers[code] = handler
+        self._raw[code] = 1 if raw else 0
+
+    def unregister(self, packet_class: type) -> None:
+        """Stop calling a handler for packets of type ``packet_class``."""
+        header = packet_class._TYPE_HEADER
+        if header == b"RT":
+            self._text_handler = None
+            return
+        self._handlers[header[1]] = None
+
+    def dispatch(self, packet: Packet) -> bool:
+        """Call the handler for ``packet``, such as a packet returned by
+        ``Packet.from_stream()``. Return ``False`` if its type has no handler.
+        """
+        header = packet._TYPE_HEADER
+        if header == b"RT":
+            handler = self._text_handler
+            if handler is None:
+                return False
+            handler(packet.text if self._text_raw else packet)
+            return True
+        code = header[1]
+        handler = self._handlers[code]
+        if handler is None:
+            return False
+        if self._raw[code]:
+            handler(*packet._values())
+        else:
+            handler(packet)
+        return True
+
+    def poll(self, reader: PacketReader) -> int:
+        """Read all the packets available now from ``reader``, and call their handlers
+        as they are read. Return the number of handlers called.
+        """
+        return reader._dispatch(self._handlers, self._raw, self._text_handler, self._text_raw)
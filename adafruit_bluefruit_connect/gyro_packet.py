@@ -21,6 +21,7 @@ class GyroPacket(_XYZPacket):
     """A packet of x, y, z float values from a gyroscope."""
 
     # Everything else is handled by _XYZPacket.
+    __slots__ = ()
     _TYPE_HEADER: bytes = b"!G"
 
 
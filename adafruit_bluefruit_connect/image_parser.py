@@ -8,43 +8,148 @@
 
 Parse chunks of data making up an image sent by the BLE Connect app.
 
-Current limitations:
- - 16bit 565 format only
+Supported color spaces:
+ - 16: RGB565 pixels, low byte first
+ - 24: RGB888 pixels, as red, green, and blue bytes, converted to RGB565
+ - 8: 8-bit palette indices, written to the bitmap as they are
 
 * Author(s): Tim Cocks, Claude Sonnet 4.5
 
 """
 
+from array import array
+
+try:
+    import bitmaptools
+except ImportError:
+    # Not available on host computers. Pixels are then written one at a time.
+    bitmaptools = None
+
 
 class BLEImageParser:
     """
     Stateful parser for BLE image data received in chunks.
     Writes pixels to bitmap as data arrives without buffering the full image.
+
+    Instead of a bitmap, the pixels can be written to a framebuffer: a
+    ``bytearray`` or ``memoryview`` holding RGB565 pixels, two bytes each, row
+    after row. The received bytes are copied straight into it. 8-bit images are
+    written to a framebuffer one byte per pixel.
+
+    For 8-bit images, the bitmap should have a palette with the colors the app
+    sent the image with. Sending 8-bit images takes half the data of RGB565.
+
+    The checksum byte at the end of the image is checked against the data as it
+    arrives. After each image, ``checksum_ok`` tells whether it matched.
+
+    Images larger than the target can be cropped and scaled down as they arrive.
+    The crop window is taken from the image first, and then every ``scale``-th
+    pixel of every ``scale``-th row of it is kept. Rows that are not kept are
+    skipped without being copied.
+
+    To show an image while it arrives, ``dirty_rows()`` gives the range of target
+    rows written since it was last called, and ``row_callback`` can be called as
+    each band of rows is completed.
     """
 
-    def __init__(self, bitmap, debug=False):
+    # Lookup tables giving the RGB565 bits for each red, green, and blue byte value,
+    # shared by all parsers. Made when the first RGB888 image arrives.
+    _rgb565_tables = None
+    # Assigned to a slice of a row array to empty it, keeping its memory.
+    _NO_PIXELS = array("H")
+
+    def __init__(
+        self,
+        bitmap,
+        debug=False,
+        framebuffer=None,
+        stride=None,
+        swap_bytes=False,
+        scale=1,
+        crop=None,
+        row_callback=None,
+        callback_rows=16,
+    ):
         """Initialize the parser.
 
-        :param Bitmap bitmap: The Bitmap object to write image data into
+        :param Bitmap bitmap: The Bitmap object to write image data into.
+            May be None if ``framebuffer`` is given.
         :param bool debug: Whether to enable debug prints
+        :param framebuffer: A bytearray or memoryview to write RGB565 pixels into,
+            instead of ``bitmap``. Each image must fit in it.
+        :param int stride: The number of bytes from the start of one framebuffer row
+            to the next. Defaults to the bytes per pixel times the image width.
+        :param bool swap_bytes: Whether to store each framebuffer pixel high byte first,
+            for big-endian displays, instead of low byte first as received.
+        :param int scale: Keep one pixel in ``scale`` across and down, to shrink images
+            by that factor.
+        :param tuple crop: The part of each image to keep, as
+            ``(x, y, width, height)`` in image pixels, or None to keep the whole image.
+            It is trimmed to the image size.
+        :param row_callback: A function to call with ``(first_row, end_row)`` each time
+            at least ``callback_rows`` more target rows are complete, and when the image
+            is complete. ``end_row`` is one past the last complete row.
+        :param int callback_rows: How many complete rows to wait for between calls
+            of ``row_callback``.
         """
+        if scale < 1:
+            raise ValueError("scale must be at least 1")
         self.bitmap = bitmap
         self.debug = debug
+        self._framebuffer = None if framebuffer is None else memoryview(framebuffer)
+        self._stride = stride
+        self._swap_bytes = swap_bytes
+        self._scale = scale
+        self._crop = crop
+        # The crop window and framebuffer row stride for the current image.
+        self._crop_x = 0
+        self._crop_y = 0
+        self._crop_width = 0
+        self._crop_height = 0
+        self._row_stride = 0
+        # True if the image is cropped or scaled.
+        self._transformed = False
+        # True if each received pixel is written, and a framebuffer row is an image row.
+        self._contiguous = False
+        # One row of pixels, copied out of the received chunks so that
+        # it can be viewed as 16-bit values.
+        self._row_buffer = None
+        self._row_view = None
+        self._row_pixels = None
+        # Where memoryviews can't be cast, the row as 16-bit values for arrayblit().
+        self._row_array = None
+        self._row_callback = row_callback
+        self._callback_rows = callback_rows
+        # Height of the current image in the target.
+        self._out_height = 0
+        # Target rows written since dirty_rows() was last called: start, and one past the end.
+        self._dirty_start = 0
+        self._dirty_end = 0
+        self.checksum_ok = None
+        """True if the last complete image had a correct checksum, False if not,
+        or None if no image has been completed since the last ``reset()``."""
         self.reset()
 
     def reset(self):
         """Reset the parser state for a new image."""
         self._header_buffer = bytearray()
-        self._partial_pixel = bytearray()  # For incomplete pixel at chunk boundary
+        # For incomplete pixel at chunk boundary: the bytes received so far,
+        # combined little-endian, and how many there are.
+        self._partial_value = 0
+        self._partial_count = 0
         self._header_parsed = False
         self._width = 0
         self._height = 0
         self._color_space = 0
+        self._bytes_per_pixel = 2
         self._expected_total_size = 0
         self._bytes_received = 0
-        self._current_x = 0
-        self._current_y = 0
+        self._pixel_index = 0  # Number of pixels written so far
+        self._rows_reported = 0  # Complete target rows passed to row_callback so far
         self._crc_byte = None
+        # Sum of the bytes received before the CRC byte, modulo 256
+        self._checksum_sum = 0
+        self.checksum_ok = None
 
     def add_chunk(self, chunk_data):
         """
@@ -75,8 +180,12 @@ class BLEImageParser:
                 # Get color space
                 self._color_space = self._header_buffer[2]
 
-                if self._color_space != 16:
-                    raise ValueError(f"Only 16-bit 565 format supported, got {self._color_space}")
+                if self._color_space not in {8, 16, 24}:
+                    raise ValueError(
+                        "Only 8-bit indexed, 16-bit 565, and 24-bit 888 formats supported, "
+                        f"got {self._color_space}"
+                    )
+                self._bytes_per_pixel = self._color_space // 8
 
                 # Get width (uint16 little endian)
                 self._width = self._header_buffer[3] | (self._header_buffer[4] << 8)
@@ -84,9 +193,10 @@ class BLEImageParser:
                 # Get height (uint16 little endian)
                 self._height = self._header_buffer[5] | (self._header_buffer[6] << 8)
 
+                self._setup_target()
+
                 # Calculate expected total size
-                bytes_per_pixel = 2  # 16-bit = 2 bytes
-                pixel_data_size = self._width * self._height * bytes_per_pixel
+                pixel_data_size = self._width * self._height * self._bytes_per_pixel
                 self._expected_total_size = 7 + pixel_data_size + 1  # header + pixels + CRC
 
                 self._header_parsed = True
@@ -99,86 +209,337 @@ class BLEImageParser:
 
         # Process pixel data
         if self._header_parsed and chunk_idx < len(chunk_data):
-            # Handle partial pixel from previous chunk
-            if len(self._partial_pixel) > 0:
-                bytes_needed = 2 - len(self._partial_pixel)
-                bytes_to_take = min(bytes_needed, len(chunk_data) - chunk_idx)
-                self._partial_pixel.extend(chunk_data[chunk_idx : chunk_idx + bytes_to_take])
-                chunk_idx += bytes_to_take
-                self._bytes_received += bytes_to_take
-
-                # If we now have a complete pixel, write it
-                if len(self._partial_pixel) == 2:
-                    pixel_565 = self._partial_pixel[0] | (self._partial_pixel[1] << 8)
-                    self.bitmap[self._current_x, self._current_y] = pixel_565
-
-                    # Advance position
-                    self._current_x += 1
-                    if self._current_x >= self._width:
-                        self._current_x = 0
-                        self._current_y += 1
-
-                    self._partial_pixel = bytearray()
-
-            # Process remaining complete pixels in this chunk
-            while chunk_idx + 1 < len(chunk_data):
-                # Check if we've finished all pixels
-                pixels_written = self._current_y * self._width + self._current_x
-                total_pixels = self._width * self._height
-
-                if pixels_written >= total_pixels:
-                    # We're at the CRC byte
-                    self._crc_byte = chunk_data[chunk_idx]
-                    self._bytes_received += 1
-                    chunk_idx += 1
-                    break
-
-                # Read complete pixel
-                low_byte = chunk_data[chunk_idx]
-                high_byte = chunk_data[chunk_idx + 1]
-                pixel_565 = low_byte | (high_byte << 8)
+            total_pixels = self._width * self._height
+            bytes_per_pixel = self._bytes_per_pixel
 
-                self.bitmap[self._current_x, self._current_y] = pixel_565
-
-                # Advance position
-                self._current_x += 1
-                if self._current_x >= self._width:
-                    self._current_x = 0
-                    self._current_y += 1
-
-                chunk_idx += 2
-                self._bytes_received += 2
+            # Handle partial pixel from previous chunk
+            while 0 < self._partial_count < bytes_per_pixel and chunk_idx < len(chunk_data):
+                self._partial_value |= chunk_data[chunk_idx] << (8 * self._partial_count)
+                self._partial_count += 1
+                chunk_idx += 1
+                self._bytes_received += 1
+
+            # If we now have a complete pixel, write it
+            if self._partial_count == bytes_per_pixel:
+                self._write_pixel(self._partial_value)
+                self._partial_value = 0
+                self._partial_count = 0
+
+            # Write the complete pixels in this chunk, a row at a time
+            pixel_count = min(
+                (len(chunk_data) - chunk_idx) // bytes_per_pixel, total_pixels - self._pixel_index
+            )
+            if pixel_count > 0:
+                self._write_pixels(chunk_data, chunk_idx, pixel_count)
+                chunk_idx += pixel_count * bytes_per_pixel
+                self._bytes_received += pixel_count * bytes_per_pixel
 
             # Handle incomplete pixel at end of chunk
             if chunk_idx < len(chunk_data):
-                pixels_written = self._current_y * self._width + self._current_x
-                total_pixels = self._width * self._height
-
-                if pixels_written < total_pixels:
+                if self._pixel_index < total_pixels:
                     # Save partial pixel for next chunk
-                    self._partial_pixel.extend(chunk_data[chunk_idx:])
-                    self._bytes_received += len(chunk_data) - chunk_idx
+                    while chunk_idx < len(chunk_data):
+                        self._partial_value |= chunk_data[chunk_idx] << (8 * self._partial_count)
+                        self._partial_count += 1
+                        chunk_idx += 1
+                        self._bytes_received += 1
                 elif self._crc_byte is None:
                     # This must be the CRC byte
                     self._crc_byte = chunk_data[chunk_idx]
                     self._bytes_received += 1
 
+        # Everything up to chunk_idx is image data before the CRC byte
+        self._checksum_sum = (self._checksum_sum + sum(memoryview(chunk_data)[0:chunk_idx])) & 0xFF
+
+        if self._row_callback is not None and self._header_parsed:
+            self._report_rows()
+
         # Check if we're complete
-        if self._bytes_received >= self._expected_total_size:
-            pixels_written = self._current_y * self._width + self._current_x
+        if self._header_parsed and self._bytes_received >= self._expected_total_size:
             if self.debug:
-                print(f"Successfully parsed {pixels_written} pixels")
+                print(f"Successfully parsed {self._pixel_index} pixels")
 
-            # Optional: Verify CRC
-            if self._crc_byte is not None:
-                # crc_calculated = calculate_crc(...)
-                # if self.crc_byte != crc_calculated:
-                #     print("Warning: CRC mismatch")
-                pass
+            # Same checksum as the app's packets: the inverted sum of all the bytes
+            checksum_ok = self._crc_byte == ~self._checksum_sum & 0xFF
+            if self.debug and not checksum_ok:
+                print("Warning: CRC mismatch")
 
             self.reset()
+            self.checksum_ok = checksum_ok
             return True
 
         if self.debug:
             print(f"Progress: {self._bytes_received}/{self._expected_total_size} bytes received")
         return False
+
+    def dirty_rows(self):
+        """
+        Return the range of target rows written since the last call, as
+        ``(first_row, end_row)``, where ``end_row`` is one past the last row written,
+        or None if no rows have been written. Rows of a completed image are reported
+        after ``add_chunk()`` returns True.
+        """
+        if self._dirty_start >= self._dirty_end:
+            return None
+        rows = (self._dirty_start, self._dirty_end)
+        self._dirty_start = 0
+        self._dirty_end = 0
+        return rows
+
+    def _mark_dirty(self, first_row, end_row):
+        if self._dirty_start >= self._dirty_end:
+            self._dirty_start = first_row
+            self._dirty_end = end_row
+        else:
+            self._dirty_start = min(self._dirty_start, first_row)
+            self._dirty_end = max(self._dirty_end, end_row)
+
+    def _report_rows(self):
+        """Call row_callback if enough target rows have been completed since the last call."""
+        if not self._width:
+            # An image with no columns has no pixels, so no rows are ever written.
+            return
+        # Image rows that are complete, and so the target rows made from them
+        complete = self._pixel_index // self._width - self._crop_y
+        complete = min(max(complete + self._scale - 1, 0) // self._scale, self._out_height)
+        start = self._rows_reported
+        if complete - start >= self._callback_rows or (
+            complete == self._out_height and complete > start
+        ):
+            self._rows_reported = complete
+            self._row_callback(start, complete)
+
+    def _setup_target(self):
+        """Work out where the pixels of a new image go, and check that they fit."""
+        if self._crop is None:
+            crop_x, crop_y, crop_width, crop_height = 0, 0, self._width, self._height
+        else:
+            crop_x, crop_y, crop_width, crop_height = self._crop
+            crop_width = min(crop_width, self._width - crop_x)
+            crop_height = min(crop_height, self._height - crop_y)
+            if crop_x < 0 or crop_y < 0 or crop_width <= 0 or crop_height <= 0:
+                raise ValueError("Crop window is outside the image")
+        self._crop_x = crop_x
+        self._crop_y = crop_y
+        self._crop_width = crop_width
+        self._crop_height = crop_height
+        out_width = (crop_width + self._scale - 1) // self._scale
+        out_height = (crop_height + self._scale - 1) // self._scale
+        self._out_height = out_height
+        self._transformed = (
+            self._scale != 1 or crop_width != self._width or crop_height != self._height
+        )
+
+        if self._framebuffer is not None:
+            # Bytes per pixel in the framebuffer
+            size = 1 if self._color_space == 8 else 2
+            self._row_stride = out_width * size if self._stride is None else self._stride
+            if (
+                self._row_stride < out_width * size
+                or len(self._framebuffer) < self._row_stride * out_height
+            ):
+                raise ValueError(f"{out_width}x{out_height} image does not fit in framebuffer")
+            self._contiguous = (
+                self._color_space != 24
+                and not self._transformed
+                and self._row_stride == self._width * size
+            )
+        elif out_width > self.bitmap.width or out_height > self.bitmap.height:
+            raise ValueError(f"{out_width}x{out_height} image does not fit in bitmap")
+
+        # The row buffer is also used to convert RGB888 pixels for a framebuffer.
+        if self._framebuffer is not None and self._color_space != 24:
+            return
+        if self._row_buffer is None or len(self._row_buffer) < out_width * 2:
+            self._row_buffer = bytearray(out_width * 2)
+            self._row_view = memoryview(self._row_buffer)
+            if hasattr(memoryview, "cast"):
+                self._row_pixels = self._row_view.cast("H")
+            elif self._framebuffer is None:
+                self._row_array = array("H", [0] * out_width)
+
+    def _write_pixel(self, pixel):
+        """
+        Write a single pixel at the current position, if it is kept. ``pixel`` holds
+        the received bytes of the pixel, the first in the lowest bits.
+        """
+        index = self._pixel_index
+        self._pixel_index = index + 1
+        scale = self._scale
+        column = index % self._width - self._crop_x
+        row = index // self._width - self._crop_y
+        if (
+            column < 0
+            or row < 0
+            or column >= self._crop_width
+            or row >= self._crop_height
+            or column % scale
+            or row % scale
+        ):
+            return
+        x = column // scale
+        y = row // scale
+        self._mark_dirty(y, y + 1)
+        if self._color_space == 24:
+            red, green, blue = self._rgb565_lookup()
+            pixel = red[pixel & 0xFF] | green[(pixel >> 8) & 0xFF] | blue[pixel >> 16]
+        if self._framebuffer is None:
+            self.bitmap[x, y] = pixel
+        elif self._color_space == 8:
+            self._framebuffer[y * self._row_stride + x] = pixel
+        else:
+            offset = y * self._row_stride + x * 2
+            if self._swap_bytes:
+                pixel = ((pixel & 0xFF) << 8) | (pixel >> 8)
+            self._framebuffer[offset] = pixel & 0xFF
+            self._framebuffer[offset + 1] = pixel >> 8
+
+    def _write_pixels(self, chunk_data, offset, pixel_count):
+        """
+        Write ``pixel_count`` whole pixels, starting at ``chunk_data[offset]``,
+        at the current position. Each row, or part of a row, is written with one
+        copy or one call to ``bitmaptools.arrayblit()`` when available. Pixels are
+        only handled one at a time in Python where a chunk splits one, when RGB888
+        pixels are converted, and, on CircuitPython, whose memoryviews can't be sliced
+        with a step, when a scaled image's rows are gathered.
+        """
+        data = memoryview(chunk_data)
+        size = self._bytes_per_pixel
+        index = self._pixel_index
+        self._pixel_index = index + pixel_count
+        if self._contiguous:
+            # Framebuffer rows line up with image rows, so copy everything at once.
+            self._gather(self._framebuffer, index * size, data, offset, size, pixel_count, size)
+            self._mark_dirty(index // self._width, (index + pixel_count - 1) // self._width + 1)
+            return
+
+        width = self._width
+        end = offset + pixel_count * size
+        while offset < end:
+            x = index % width
+            run = min(width - x, (end - offset) // size)
+            self._write_run(data, offset, x, index // width, run)
+            offset += run * size
+            index += run
+
+    def _write_run(self, data, offset, x, y, run):
+        """
+        Write the kept pixels among the ``run`` pixels of image row ``y``, starting
+        at column ``x``, that start at ``data[offset]``.
+        """
+        scale = self._scale
+        size = self._bytes_per_pixel
+        if self._transformed:
+            row = y - self._crop_y
+            if row < 0 or row >= self._crop_height or row % scale:
+                return
+            # The first kept column in the run, and the column after the last one
+            first = max(x, self._crop_x)
+            first += (self._crop_x - first) % scale
+            end = min(x + run, self._crop_x + self._crop_width)
+            if first >= end:
+                return
+            count = (end - first + scale - 1) // scale
+            offset += (first - x) * size
+            target_x = (first - self._crop_x) // scale
+            target_y = row // scale
+        else:
+            count = run
+            target_x = x
+            target_y = y
+        self._mark_dirty(target_y, target_y + 1)
+
+        if self._color_space == 24:
+            # Convert to RGB565 in the row buffer, then write that.
+            self._convert_rgb888(data, offset, scale * 3, count)
+            data = self._row_view
+            offset = 0
+            scale = 1
+            size = 2
+
+        if self._framebuffer is not None:
+            target = target_y * self._row_stride + target_x * size
+            self._gather(self._framebuffer, target, data, offset, scale * size, count, size)
+            return
+
+        if data is not self._row_view:
+            self._gather(self._row_view, 0, data, offset, scale * size, count, size, swap=False)
+        bitmap = self.bitmap
+        if size == 1:
+            values = self._row_view[0:count]
+        elif self._row_pixels is not None:
+            values = self._row_pixels[0:count]
+        else:
+            # CircuitPython memoryviews can't be cast. Its array extend() copies the
+            # bytes of any buffer as they are, so this makes the 16-bit values in C.
+            values = self._row_array
+            values[0:] = self._NO_PIXELS
+            values.extend(self._row_view[0 : count * 2])
+        if bitmaptools is not None:
+            bitmaptools.arrayblit(
+                bitmap, values, target_x, target_y, target_x + count, target_y + 1
+            )
+        else:
+            for value in values:
+                bitmap[target_x, target_y] = value
+                target_x += 1
+
+    def _convert_rgb888(self, data, offset, step, count):
+        """
+        Convert ``count`` RGB888 pixels, taking one every ``step`` bytes of ``data``
+        from ``data[offset]``, to RGB565 pixels at the start of the row buffer.
+        """
+        red, green, blue = self._rgb565_lookup()
+        pixels = self._row_pixels
+        if pixels is not None:
+            for i in range(count):
+                pixels[i] = red[data[offset]] | green[data[offset + 1]] | blue[data[offset + 2]]
+                offset += step
+            return
+        row_buffer = self._row_buffer
+        for i in range(0, count * 2, 2):
+            pixel = red[data[offset]] | green[data[offset + 1]] | blue[data[offset + 2]]
+            row_buffer[i] = pixel & 0xFF
+            row_buffer[i + 1] = pixel >> 8
+            offset += step
+
+    @staticmethod
+    def _rgb565_lookup():
+        """Return the red, green, and blue lookup tables, making them if needed."""
+        if BLEImageParser._rgb565_tables is None:
+            BLEImageParser._rgb565_tables = (
+                array("H", [(value >> 3) << 11 for value in range(256)]),
+                array("H", [(value >> 2) << 5 for value in range(256)]),
+                array("H", [value >> 3 for value in range(256)]),
+            )
+        return BLEImageParser._rgb565_tables
+
+    def _gather(self, target, target_offset, data, source, step, count, size, swap=None):
+        """
+        Copy ``count`` pixels of ``size`` bytes to ``target[target_offset:]``, taking one
+        pixel every ``step`` bytes of ``data``, starting at ``data[source]``. The bytes of
+        each two-byte pixel are swapped if ``swap``, which defaults to ``swap_bytes``.
+        """
+        length = count * size
+        if swap is None:
+            swap = self._swap_bytes
+        if step == size and not (swap and size == 2):
+            target[target_offset : target_offset + length] = data[source : source + length]
+            return
+        span = (count - 1) * step + 1
+        try:
+            if size == 1:
+                target[target_offset : target_offset + length] = data[source : source + span : step]
+                return
+            low, high = (source + 1, source) if swap else (source, source + 1)
+            target[target_offset : target_offset + length : 2] = data[low : low + span : step]
+            target[target_offset + 1 : target_offset + length : 2] = data[high : high + span : step]
+        except NotImplementedError:
+            # CircuitPython memoryviews can't be sliced with a step.
+            if size == 1:
+                for i in range(count):
+                    target[target_offset + i] = data[source + i * step]
+                return
+            for i in range(count):
+                target[target_offset + 2 * i] = data[low + i * step]
+                target[target_offset + 2 * i + 1] = data[high + i * step]
@@ -0,0 +1,109 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_bluefruit_connect.link_stats`
+====================================================
+
+Counters and a decode-time histogram describing the health of a Bluefruit Connect link.
+
+* Author(s): Adafruit Industries
+
+"""
+
+from __future__ import annotations
+
+try:
+    from typing import Dict  # adjust these as needed
+except ImportError:
+    pass
+
+
+class LinkStats:
+    """Statistics about received data, updated by `PacketReader`, `PacketStream`, or
+    ``Packet.from_stream()`` when passed as their ``stats`` argument. Updating them
+    costs a few integer operations per packet, so they can be left enabled on a
+    microcontroller.
+
+    Decode times are counted in a histogram with ``HISTOGRAM_BUCKETS`` buckets.
+    Bucket 0 counts decode times under 1 microsecond, and bucket ``i`` counts
+    times from ``2**(i-1)`` up to ``2**i`` microseconds. The last bucket also
+    counts all longer times.
+
+    Decode times are measured with ``time.monotonic_ns()``, which is not available on
+    CircuitPython builds without long integer support. Readers only use it when
+    they are given a ``LinkStats``.
+    """
+
+    HISTOGRAM_BUCKETS = 16
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Set all the counters to zero."""
+        self.bytes_read = 0
+        """Number of bytes received."""
+        self.packets: Dict[bytes, int] = {}
+        """Number of valid packets received, keyed by packet type header, such as ``b"!A"``.
+        This includes packets a `Dispatcher` skipped without decoding them."""
+        self.bad_checksums = 0
+        """Number of packets with a bad checksum."""
+        self.unregistered_headers = 0
+        """Number of packet starts with an unregistered packet type."""
+        self.malformed_packets = 0
+        """Number of packets with a good checksum but invalid data."""
+        self.skipped_bytes = 0
+        """Number of received bytes discarded because they were not part of a valid packet."""
+        self.resyncs = 0
+        """Number of times a bad packet made the reader scan again for a packet start."""
+        self.raw_text_lines = 0
+        """Number of raw text lines received."""
+        self.decode_time_ns = 0
+        """Total time spent decoding packets, in nanoseconds."""
+        self.max_decode_time_ns = 0
+        """Longest time spent decoding a packet, in nanoseconds."""
+        self.decode_histogram = [0] * self.HISTOGRAM_BUCKETS
+        """Counts of packet decode times. See the class description for the buckets.
+        Packets that were not decoded are not counted here."""
+
+    def record_packet(self, header: bytes, decode_time_ns: int) -> None:
+        """Count a decoded packet of type ``header`` that took ``decode_time_ns`` to decode."""
+        packets = self.packets
+        packets[header] = packets.get(header, 0) + 1
+        self.decode_time_ns += decode_time_ns
+        self.max_decode_time_ns = max(self.max_decode_time_ns, decode_time_ns)
+        micros = decode_time_ns // 1000
+        bucket = 0
+        last = self.HISTOGRAM_BUCKETS - 1
+        while micros and bucket < last:
+            micros >>= 1
+            bucket += 1
+        self.decode_histogram[bucket] += 1
+
+    def record_undecoded_packet(self, header: bytes) -> None:
+        """Count a valid packet of type ``header`` that was skipped without being decoded."""
+        packets = self.packets
+        packets[header] = packets.get(header, 0) + 1
+
+    @property
+    def packet_count(self) -> int:
+        """Total number of valid packets received."""
+        return sum(self.packets.values())
+
+    def snapshot(self) -> dict:
+        """Return a copy of all the counters in a dict, keyed by counter name."""
+        return {
+            "bytes_read": self.bytes_read,
+            "packets": dict(self.packets),
+            "bad_checksums": self.bad_checksums,
+            "unregistered_headers": self.unregistered_headers,
+            "malformed_packets": self.malformed_packets,
+            "skipped_bytes": self.skipped_bytes,
+            "resyncs": self.resyncs,
+            "raw_text_lines": self.raw_text_lines,
+            "decode_time_ns": self.decode_time_ns,
+            "max_decode_time_ns": self.max_decode_time_ns,
+            "decode_histogram": list(self.decode_histogram),
+        }
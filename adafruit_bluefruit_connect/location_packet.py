@@ -14,16 +14,15 @@ Bluefruit Connect App geographical location packet.
 
 from __future__ import annotations
 
-import struct
-
 from .packet import Packet
 
 
 class LocationPacket(Packet):
     """A packet of latitude, longitude, and altitude values."""
 
+    __slots__ = ("_latitude", "_longitude", "_altitude")
+
     _FMT_PARSE: str = "<xxfffx"
-    PACKET_LENGTH: int = struct.calcsize(_FMT_PARSE)
     # _FMT_CONSTRUCT doesn't include the trailing checksum byte.
     _FMT_CONSTRUCT: str = "<2sfff"
     _TYPE_HEADER: bytes = b"!L"
@@ -34,16 +33,26 @@ class LocationPacket(Packet):
         self._longitude = longitude
         self._altitude = altitude
 
-    def to_bytes(self) -> bytes:
-        """Return the bytes needed to send this packet."""
-        partial_packet = struct.pack(
-            self._FMT_CONSTRUCT,
+    def _load(self, packet: bytes, offset: int = 0) -> None:
+        self._latitude, self._longitude, self._altitude = self._unpack(packet, offset)
+
+    def _values(self) -> tuple:
+        return self._latitude, self._longitude, self._altitude
+
+    def to_bytes_into(self, buffer: bytearray, offset: int = 0) -> int:
+        """Write the bytes needed to send this packet into ``buffer``, starting at ``offset``.
+        Return the offset just past the packet.
+        """
+        self._pack_into(
+            self._STRUCT_CONSTRUCT,
+            buffer,
+            offset,
             self._TYPE_HEADER,
             self._latitude,
             self._longitude,
             self._altitude,
         )
-        return self.add_checksum(partial_packet)
+        return self._add_checksum_into(buffer, offset)
 
     @property
     def latitude(self) -> float:
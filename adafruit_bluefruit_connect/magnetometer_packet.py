@@ -21,6 +21,7 @@ class MagnetometerPacket(_XYZPacket):
     """A packet of x, y, z float values from a magnetometer."""
 
     # Everything else is handled by _XYZPacket.
+    __slots__ = ()
     _TYPE_HEADER: bytes = b"!M"
 
 
@@ -0,0 +1,190 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_bluefruit_connect.numpy_decoder`
+====================================================
+
+Vectorized decoding of captured Bluefruit Connect App controller streams into
+NumPy structured arrays, for offline analysis on a host computer.
+
+This module requires NumPy, and is not for use on a microcontroller.
+
+* Author(s): Adafruit Industries
+
+"""
+
+from __future__ import annotations
+
+import struct
+
+import numpy as np
+
+# Import every controller packet type, so that all of them are registered.
+from .accelerometer_packet import AccelerometerPacket
+from .button_packet import ButtonPacket
+from .color_packet import ColorPacket
+from .gyro_packet import GyroPacket
+from .location_packet import LocationPacket
+from .magnetometer_packet import MagnetometerPacket
+from .packet import Packet
+from .quaternion_packet import QuaternionPacket
+
+try:
+    from typing import Dict, Tuple  # adjust these as needed
+except ImportError:
+    pass
+
+_FIELD_NAMES = {
+    AccelerometerPacket: ("x", "y", "z"),
+    GyroPacket: ("x", "y", "z"),
+    MagnetometerPacket: ("x", "y", "z"),
+    QuaternionPacket: ("x", "y", "z", "w"),
+    LocationPacket: ("latitude", "longitude", "altitude"),
+    ColorPacket: ("red", "green", "blue"),
+    ButtonPacket: ("button", "pressed"),
+}
+
+# The longest packet, less one byte: how far a packet may extend past a block.
+_MAX_OVERHANG = max(cls.PACKET_LENGTH for cls in _FIELD_NAMES) - 1
+
+
+def packet_dtype(packet_class: type) -> np.dtype:
+    """Return a structured dtype with the same layout as ``packet_class._FMT_PARSE``.
+    Its ``itemsize`` is the whole packet, including the header and checksum bytes,
+    which are not named fields.
+    """
+    names = _FIELD_NAMES[packet_class]
+    fmt = packet_class._FMT_PARSE
+    byte_order = fmt[0]
+    formats = []
+    offsets = []
+    offset = 0
+    count = ""
+    for code in fmt[1:]:
+        if code.isdigit():
+            count += code
+            continue
+        repeat = int(count or "1")
+        count = ""
+        if code == "x":
+            offset += repeat
+        elif code == "s":
+            formats.append(f"S{repeat}")
+            offsets.append(offset)
+            offset += repeat
+        else:
+            size = struct.calcsize(byte_order + code)
+            for _ in range(repeat):
+                formats.append(np.dtype(byte_order + code))
+                offsets.append(offset)
+                offset += size
+    return np.dtype(
+        {
+            "names": names,
+            "formats": formats,
+            "offsets": offsets,
+            "itemsize": packet_class.PACKET_LENGTH,
+        }
+    )
+
+
+def _packet_lengths() -> np.ndarray:
+    """Return an array giving the packet length for each registered type code, or 0."""
+    lengths = np.zeros(256, dtype=np.int64)
+    for code, packet_class in Packet._code_to_class.items():
+        lengths[code] = packet_class.PACKET_LENGTH
+    return lengths
+
+
+def _find_in_block(
+    data: np.ndarray, start: int, stop: int, lengths: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Find the valid packets starting in ``data[start:stop]``.
+    Return their offsets in ``data`` and their lengths.
+    """
+    end = min(len(data), stop + _MAX_OVERHANG)
+    block = data[start:end]
+    bangs = np.flatnonzero(block[: stop - start] == 0x21)
+    bangs = bangs[bangs + 1 < len(block)]
+    packet_lengths = lengths[block[bangs + 1]]
+    complete = (packet_lengths > 0) & (bangs + packet_lengths <= len(block))
+    starts = bangs[complete]
+    packet_lengths = packet_lengths[complete]
+
+    # Checksums: the data bytes plus the checksum byte add up to 0xFF, modulo 256.
+    valid = np.zeros(len(starts), dtype=bool)
+    for length in np.unique(packet_lengths):
+        of_length = np.flatnonzero(packet_lengths == length)
+        rows = block[starts[of_length, None] + np.arange(length)]
+        valid[of_length] = rows.sum(axis=1, dtype=np.uint8) == 0xFF
+
+    # Button packets whose pressed state is not b"0" or b"1" fail to decode,
+    # so PacketReader skips them, as a b'!' followed by bad data.
+    buttons = np.flatnonzero(block[starts + 1] == ButtonPacket._TYPE_HEADER[1])
+    pressed = block[starts[buttons] + 3]
+    valid[buttons[(pressed != 0x30) & (pressed != 0x31)]] = False
+    starts = starts[valid]
+    ends = starts + packet_lengths[valid]
+
+    # A b'!' inside a valid packet may look like a valid packet too. Keep the
+    # packets a sequential decoder would find: drop any candidate overlapping an
+    # earlier candidate that overlaps nothing before it, until nothing overlaps.
+    while len(starts) > 1:
+        overlap = np.zeros(len(starts), dtype=bool)
+        overlap[1:] = starts[1:] < np.maximum.accumulate(ends)[:-1]
+        if not overlap.any():
+            break
+        clean_ends = np.maximum.accumulate(np.where(overlap, 0, ends))
+        drop = np.zeros(len(starts), dtype=bool)
+        drop[1:] = starts[1:] < clean_ends[:-1]
+        starts = starts[~drop]
+        ends = ends[~drop]
+
+    return starts + start, ends - starts
+
+
+def find_packets(data: bytes, block_size: int = 1 << 24) -> np.ndarray:
+    """Return the offsets of all valid controller packets in a captured byte stream,
+    in order. Bytes that are not part of a valid packet are skipped, as
+    `PacketReader` would skip them.
+
+    :param data: the captured bytes. Anything supporting the buffer protocol may be
+      used, including an ``mmap``.
+    :param int block_size: number of bytes examined at a time, to bound memory use.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    lengths = _packet_lengths()
+    found = []
+    position = 0
+    while position < len(buf):
+        stop = min(len(buf), position + block_size)
+        starts, packet_lengths = _find_in_block(buf, position, stop, lengths)
+        found.append(starts)
+        # Continue after the last packet, which may extend past this block.
+        position = max(stop, int(starts[-1] + packet_lengths[-1])) if len(starts) else stop
+    if not found:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(found)
+
+
+def decode_capture(data: bytes, block_size: int = 1 << 24) -> Dict[bytes, np.ndarray]:
+    """Decode all the valid controller packets in a captured byte stream.
+    Return a dict mapping each packet type header, such as ``b"!A"``, to a structured
+    array of the packets of that type, in order. Each array's dtype is given
+    by `packet_dtype()`.
+
+    :param data: the captured bytes. Anything supporting the buffer protocol may be
+      used, including an ``mmap``.
+    :param int block_size: number of bytes examined at a time, to bound memory use.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    starts = find_packets(data, block_size)
+    codes = buf[starts + 1]
+    decoded = {}
+    for packet_class in _FIELD_NAMES:
+        of_type = starts[codes == packet_class._TYPE_HEADER[1]]
+        rows = buf[of_type[:, None] + np.arange(packet_class.PACKET_LENGTH)]
+        decoded[packet_class._TYPE_HEADER] = rows.view(packet_dtype(packet_class))[:, 0]
+    return decoded
@@ -15,13 +15,41 @@ Bluefruit Connect App packet superclass
 from __future__ import annotations
 
 import struct
+import time
 
 try:
     from io import RawIOBase
-    from typing import Any, Optional  # adjust these as needed
+    from typing import Any, Iterable, Iterator, Optional  # adjust these as needed
+
+    from .link_stats import LinkStats
 except ImportError:
     pass
 
+if hasattr(struct, "Struct"):
+    # Formats are compiled once, and the compiled Struct is passed to the Struct
+    # methods where the format string would go.
+    _compile_format = struct.Struct
+    _pack_into = struct.Struct.pack_into
+    _unpack_from = struct.Struct.unpack_from
+else:
+    # CircuitPython's struct module has no Struct class. The format strings are
+    # passed as they are to the struct functions, which take the same arguments.
+    _compile_format = str
+    _pack_into = struct.pack_into
+    _unpack_from = struct.unpack_from
+
+
+# The modules defining the packet types the Bluefruit Connect App sends, by type header.
+_KNOWN_PACKET_MODULES = {
+    b"!A": "accelerometer_packet",
+    b"!B": "button_packet",
+    b"!C": "color_packet",
+    b"!G": "gyro_packet",
+    b"!L": "location_packet",
+    b"!M": "magnetometer_packet",
+    b"!Q": "quaternion_packet",
+}
+
 
 class Packet:
     """
@@ -36,27 +64,87 @@ class Packet:
     This is an abstract class.
     """
 
+    # Packet objects have no __dict__. Each concrete subclass lists its own fields.
+    __slots__ = ()
+
     # All concrete subclasses should define these class attributes. They're listed here
     # as a reminder and to make pylint happy.
     # _FMT_PARSE is the whole packet.
     _FMT_PARSE: str
-    # In each class, set PACKET_LENGTH = struct.calcsize(_FMT_PARSE).
+    # PACKET_LENGTH is set from _FMT_PARSE by register_packet_type().
     PACKET_LENGTH: int
     # _FMT_CONSTRUCT does not include the trailing byte, which is the checksum.
     _FMT_CONSTRUCT: Optional[str] = None
+    # Compiled versions of _FMT_PARSE and _FMT_CONSTRUCT, set by register_packet_type().
+    # On CircuitPython they are the format strings themselves. Pass them to
+    # _pack_into() and _unpack_from(), which call struct directly on either platform.
+    _STRUCT_PARSE: Any
+    _STRUCT_CONSTRUCT: Any
+    _pack_into = staticmethod(_pack_into)
+    _unpack_from = staticmethod(_unpack_from)
     # The first byte of the prefix is always b'!'. The second byte is the type code.
     _TYPE_HEADER: Optional[bytes] = None
 
     _type_to_class: dict = {}
+    _code_to_class: dict = {}
+    # Modules to import when their packet type is first seen, by type code.
+    _lazy_modules: dict = {}
 
     @classmethod
     def register_packet_type(cls: Any) -> None:
         """Register a new packet type, using this class and its ``cls._TYPE_HEADER``.
         The ``from_bytes()`` and ``from_stream()`` methods will then be able
         to recognize this type of packet.
+
+        The class's ``_FMT_PARSE`` and ``_FMT_CONSTRUCT`` formats are compiled once here,
+        and ``PACKET_LENGTH`` is set from the size of ``_FMT_PARSE``.
         """
+        fmt_parse = getattr(cls, "_FMT_PARSE", None)
+        if fmt_parse:
+            cls._STRUCT_PARSE = _compile_format(fmt_parse)
+            cls.PACKET_LENGTH = struct.calcsize(fmt_parse)
+        if cls._FMT_CONSTRUCT:
+            cls._STRUCT_CONSTRUCT = _compile_format(cls._FMT_CONSTRUCT)
 
         Packet._type_to_class[cls._TYPE_HEADER] = cls
+        if cls._TYPE_HEADER[0] == 0x21:
+            # Also index b'!' packets by their type code, for lookups without slicing.
+            Packet._code_to_class[cls._TYPE_HEADER[1]] = cls
+
+    @staticmethod
+    def use_lazy_registry(pin: Iterable[bytes] = (), exclude: Iterable[bytes] = ()) -> None:
+        """Recognize every packet type the Bluefruit Connect App sends, without
+        importing all the packet modules up front. The module for a packet type is
+        imported, registering its class, the first time a packet of that type is seen.
+
+        :param pin: packet type headers, such as ``b"!A"``, whose modules are imported now.
+        :param exclude: packet type headers whose modules are never imported automatically.
+          Packets of those types remain unregistered unless their modules are imported.
+        """
+        package = __name__.rpartition(".")[0]
+        pin = tuple(pin)
+        exclude = tuple(exclude)
+        for header in pin + exclude:
+            if header not in _KNOWN_PACKET_MODULES:
+                raise ValueError(f"Unknown packet type {header}")
+        for header, module in _KNOWN_PACKET_MODULES.items():
+            if header in exclude:
+                Packet._lazy_modules.pop(header[1], None)
+            elif header in pin:
+                __import__(f"{package}.{module}")
+            elif header[1] not in Packet._code_to_class:
+                Packet._lazy_modules[header[1]] = f"{package}.{module}"
+
+    @staticmethod
+    def _class_for_code(code: int) -> Any:
+        """Return the registered class for the b'!' packet type ``code``, or None.
+        If the lazy registry is in use, import the module for a known type on first sight.
+        """
+        packet_class = Packet._code_to_class.get(code, None)
+        if packet_class is None and code in Packet._lazy_modules:
+            __import__(Packet._lazy_modules.pop(code))
+            packet_class = Packet._code_to_class.get(code, None)
+        return packet_class
 
     @classmethod
     def from_bytes(cls, packet: bytes) -> Packet:
@@ -65,26 +153,100 @@ class Packet:
         """
         if len(packet) < 3:
             raise ValueError("Packet too short")
-        packet_class = cls._type_to_class.get(packet[0:2], None)
+        packet_class = cls._checked_class_at(packet, 0, exact_length=True)
+
+        # A packet class may do further validation of the data.
+        return packet_class.parse_private(packet)
+
+    @classmethod
+    def decode_raw(cls, buffer: bytes, offset: int = 0) -> tuple:
+        """Decode the packet starting at ``buffer[offset]`` without creating a packet object.
+        Return a tuple of the packet's type code, such as ``ord("A")``, followed by its
+        field values: ``(code, x, y, z)`` for an ``AccelerometerPacket``, or
+        ``(code, button, pressed)`` for a ``ButtonPacket``. The values are those
+        ``parse_private()`` would pass to the class constructor.
+
+        The packet is validated as in ``parse_into()``, and raises the same Errors.
+        """
+        packet_class = cls._checked_class_at(buffer, offset)
+        return (buffer[offset + 1],) + packet_class._unpack(buffer, offset)
+
+    @classmethod
+    def iter_from_buffer(cls, buffer: bytes, offset: int = 0) -> Iterator[Packet]:
+        """Iterate over the packets stored back to back in ``buffer``, starting at ``offset``.
+        Each packet is decoded in place, without copying it out of ``buffer``.
+
+        Bytes before a b'!' packet start are skipped. Iteration stops at the end of
+        the buffer or at a packet that is not complete. The returned iterator's
+        ``remaining`` attribute is then the number of trailing bytes that were not
+        consumed, and its ``offset`` attribute is where they start.
+
+        A packet that is unregistered or malformed raises an Error, as in ``from_bytes()``.
+        Iteration may be resumed afterwards; it continues after that packet's b'!'.
+
+        :param buffer: a ``bytes``, ``bytearray``, or ``memoryview`` holding the packets
+        :param int offset: where to start in ``buffer``
+        """
+        return _BufferPacketIterator(cls, buffer, offset)
+
+    @classmethod
+    def parse_into(cls, packet: bytes, target: Packet, offset: int = 0) -> Packet:
+        """Decode the packet starting at ``packet[offset]`` into the existing packet object
+        ``target``, instead of creating a new object. ``target`` must be of the same class
+        as the packet. Validate packet type, length, and checksum, as in ``from_bytes()``.
+        Return ``target``.
+
+        Reusing one object per packet type in a receive loop avoids allocating
+        a new packet for every sample.
+        """
+        packet_class = cls._checked_class_at(packet, offset)
+        if type(target) is not packet_class:
+            raise ValueError(f"Target is not a {packet_class.__name__}")
+
+        target._load(packet, offset)
+        return target
+
+    @classmethod
+    def _packet_class_at(cls, buffer: bytes, offset: int) -> Any:
+        """Return the registered class for the packet header at ``buffer[offset]``."""
+        packet_class = None
+        if buffer[offset] == 0x21:
+            packet_class = cls._class_for_code(buffer[offset + 1])
         if not packet_class:
-            raise ValueError(f"Unregistered packet type {packet[0:2]}")
+            raise ValueError(f"Unregistered packet type {bytes(buffer[offset : offset + 2])}")
 
         # In case this was called from a subclass, make sure the parsed
         # type matches up with the current class.
         if not issubclass(packet_class, cls):
             raise ValueError(f"Packet type is not a {cls.__name__}")
+        return packet_class
 
-        if len(packet) != packet_class.PACKET_LENGTH:
-            raise ValueError("Wrong length packet")
+    @classmethod
+    def _checked_class_at(cls, buffer: bytes, offset: int, exact_length: bool = False) -> Any:
+        """Return the registered class for the packet at ``buffer[offset]``, after checking
+        that the whole packet is there and that its checksum is correct. If ``exact_length``
+        is ``True``, the packet must also end at the end of ``buffer``.
+        """
+        packet_class = cls._packet_class_at(buffer, offset)
+        length = packet_class.PACKET_LENGTH
+        if exact_length:
+            if len(buffer) - offset != length:
+                raise ValueError("Wrong length packet")
+        elif len(buffer) - offset < length:
+            raise ValueError("Packet too short")
 
-        if cls.checksum(packet[0:-1]) != packet[-1]:
-            raise ValueError("Bad checksum")
+        cls._verify_checksum_at(buffer, offset, length)
+        return packet_class
 
-        # A packet class may do further validation of the data.
-        return packet_class.parse_private(packet)
+    @classmethod
+    def _verify_checksum_at(cls, buffer: bytes, offset: int, length: int) -> None:
+        """Check the checksum of the ``length``-byte packet at ``buffer[offset]``."""
+        checksum_offset = offset + length - 1
+        if cls.checksum(memoryview(buffer)[offset:checksum_offset]) != buffer[checksum_offset]:
+            raise ValueError("Bad checksum")
 
     @classmethod
-    def from_stream(cls, stream: RawIOBase) -> Optional[Packet]:
+    def from_stream(cls, stream: RawIOBase, stats: Optional[LinkStats] = None) -> Optional[Packet]:
         """Read the next packet from the incoming stream. Wait as long as the timeout
         set on stream, using its own preset timeout.
         Return None if there was no input, otherwise return an instance
@@ -96,6 +258,9 @@ class Packet:
 
         :param stream stream: an input stream that provides standard stream read operations,
           such as ``ble.UARTServer`` or ``busio.UART``.
+        :param LinkStats stats: if given, a `LinkStats` object that is updated with what
+          is read, as a `PacketReader` would update it. A packet cut short by the
+          stream's timeout is counted as a bad checksum.
         """
         # Loop looking for a b'!' packet start. If the buffer has overflowed,
         # or there's been some other problem, we may need to skip some characters
@@ -105,6 +270,8 @@ class Packet:
             if not start:
                 # Timeout: nothing read.
                 return None
+            if stats is not None:
+                stats.bytes_read += 1
 
             if start == b"!":
                 # Found start of packet.
@@ -112,6 +279,8 @@ class Packet:
                 if not packet_type:
                     # Timeout: nothing more read.
                     return None
+                if stats is not None:
+                    stats.bytes_read += 1
                 break
 
             # Didn't find a packet start.
@@ -120,30 +289,70 @@ class Packet:
             # If so, read an entire line and pass that to RawTextPacket.
             if raw_text_packet_cls:
                 packet = bytes(start + stream.readline())
+                if stats is not None:
+                    stats.bytes_read += len(packet) - 1
+                    stats.raw_text_lines += 1
                 return raw_text_packet_cls(packet)
 
             # else loop and try again.
+            if stats is not None:
+                stats.skipped_bytes += 1
 
         header = bytes(start + packet_type)
-        packet_class = cls._type_to_class.get(header, None)
+        packet_class = cls._class_for_code(packet_type[0])
         if not packet_class:
+            if stats is not None:
+                stats.unregistered_headers += 1
             raise ValueError(f"Unregistered packet type {header}")
         rest = stream.read(packet_class.PACKET_LENGTH - 2)
         assert rest is not None
         packet = header + rest
-        return cls.from_bytes(packet)
+        if stats is None:
+            return cls.from_bytes(packet)
+
+        stats.bytes_read += len(rest)
+        decode_start = time.monotonic_ns()
+        try:
+            result = cls.from_bytes(packet)
+        except ValueError:
+            if len(packet) == packet_class.PACKET_LENGTH and (
+                cls.checksum(packet[:-1]) == packet[-1]
+            ):
+                stats.malformed_packets += 1
+            else:
+                stats.bad_checksums += 1
+            raise
+        stats.record_packet(header, time.monotonic_ns() - decode_start)
+        return result
 
     @classmethod
-    def parse_private(cls, packet: bytes) -> Optional[Packet]:
+    def parse_private(cls, packet: bytes, offset: int = 0) -> Optional[Packet]:
         """Default implementation for subclasses.
         Assumes arguments to ``__init__()`` are exactly the values parsed using
-        ``cls._FMT_PARSE``. Subclasses may need to reimplement if that assumption
-        is not correct.
+        ``cls._STRUCT_PARSE``. Subclasses may need to reimplement if that assumption
+        is not correct. The packet starts at ``packet[offset]``.
 
         Do not call this directly. It's called from ``cls.from_bytes()``.
         pylint makes it difficult to call this method _parse(), hence the name.
         """
-        return cls(*struct.unpack(cls._FMT_PARSE, packet))
+        return cls(*cls._unpack(packet, offset))
+
+    @classmethod
+    def _unpack(cls, packet: bytes, offset: int = 0) -> tuple:
+        """Return the field values of the packet starting at ``packet[offset]``,
+        as passed to ``__init__()``. Subclasses that validate their data do it here.
+        """
+        return cls._unpack_from(cls._STRUCT_PARSE, packet, offset)
+
+    def _load(self, packet: bytes, offset: int = 0) -> None:
+        """Replace this object's values with those of the packet starting at
+        ``packet[offset]``. Called from ``parse_into()``.
+        """
+        raise NotImplementedError
+
+    def _values(self) -> tuple:
+        """Return this object's field values, as ``_unpack()`` would return them."""
+        raise NotImplementedError
 
     @staticmethod
     def checksum(partial_packet: bytes) -> int:
@@ -155,3 +364,84 @@ class Packet:
         with the checksum appended.
         """
         return partial_packet + bytes((self.checksum(partial_packet),))
+
+    def to_bytes(self) -> bytes:
+        """Return the bytes needed to send this packet."""
+        buffer = bytearray(self.PACKET_LENGTH)
+        self.to_bytes_into(buffer)
+        return bytes(buffer)
+
+    def to_bytes_into(self, buffer: bytearray, offset: int = 0) -> int:
+        """Write the bytes needed to send this packet into ``buffer``, starting at ``offset``.
+        Return the offset just past the packet. Implemented by each concrete subclass.
+        """
+        raise NotImplementedError
+
+    def _add_checksum_into(self, buffer: bytearray, offset: int) -> int:
+        """Compute the checksum of the partial packet written into ``buffer`` at ``offset``
+        and store it in the packet's last byte. Return the offset just past the packet.
+        """
+        checksum_offset = offset + self.PACKET_LENGTH - 1
+        buffer[checksum_offset] = self.checksum(memoryview(buffer)[offset:checksum_offset])
+        return checksum_offset + 1
+
+    @staticmethod
+    def encode_many(packets: Iterable[Packet], buffer: bytearray, offset: int = 0) -> int:
+        """Encode ``packets`` back to back into ``buffer``, starting at ``offset``, so that
+        they can all be sent with a single write, such as
+        ``uart.write(memoryview(buffer)[:end])``. Return the offset just past the last packet.
+        Raise ValueError if ``buffer`` is too small to hold all the packets.
+        """
+        size = len(buffer)
+        for packet in packets:
+            if offset + packet.PACKET_LENGTH > size:
+                raise ValueError("Buffer too small")
+            offset = packet.to_bytes_into(buffer, offset)
+        return offset
+
+
+class _BufferPacketIterator:
+    """Iterator returned by ``Packet.iter_from_buffer()``."""
+
+    def __init__(self, packet_class: Any, buffer: bytes, offset: int) -> None:
+        self._packet_class = packet_class
+        self._buffer = buffer
+        self.offset = offset
+
+    @property
+    def remaining(self) -> int:
+        """Number of bytes in the buffer that have not been consumed."""
+        return len(self._buffer) - self.offset
+
+    def __iter__(self) -> _BufferPacketIterator:
+        return self
+
+    def __next__(self) -> Packet:
+        buffer = self._buffer
+        end = len(buffer)
+        offset = self.offset
+        # Skip to a b'!' packet start.
+        while offset < end and buffer[offset] != 0x21:
+            offset += 1
+        self.offset = offset
+        if end - offset < 2:
+            raise StopIteration
+
+        try:
+            packet_class = self._packet_class._packet_class_at(buffer, offset)
+        except ValueError:
+            self.offset = offset + 1
+            raise
+        length = packet_class.PACKET_LENGTH
+        if end - offset < length:
+            # Incomplete packet: leave it for the next buffer.
+            raise StopIteration
+
+        try:
+            packet_class._verify_checksum_at(buffer, offset, length)
+            packet = packet_class.parse_private(buffer, offset)
+        except ValueError:
+            self.offset = offset + 1
+            raise
+        self.offset = offset + length
+        return packet
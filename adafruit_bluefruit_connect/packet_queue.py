@@ -0,0 +1,180 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_bluefruit_connect.packet_queue`
+====================================================
+
+Bounded receive queue with per-packet-type priorities and drop policies, so that
+events like button presses are not held up behind floods of sensor data.
+
+* Author(s): Adafruit Industries
+
+"""
+
+from __future__ import annotations
+
+try:
+    from typing import Dict, List, Optional  # adjust these as needed
+
+    from .packet import Packet
+    from .packet_reader import PacketReader
+except ImportError:
+    pass
+
+
+class PacketQueue:
+    """A bounded queue of received packets that sits between a `PacketReader` and the
+    program. Each packet type can be given a priority and a drop policy with
+    `set_policy()`. `get()` returns packets with the lowest priority number first,
+    and packets of equal priority in the order they arrived.
+
+    When the queue is full, room is made by dropping the oldest droppable packet
+    with the largest priority number, no more important than the new packet. If there
+    is none, the new packet is dropped instead, unless its policy is ``KEEP``.
+
+    A typical setup::
+
+        queue = PacketQueue(capacity=32)
+        queue.set_policy(ButtonPacket, priority=0, policy=PacketQueue.KEEP)
+        queue.set_policy(LocationPacket, priority=2, policy=PacketQueue.LATEST)
+        queue.set_policy(AccelerometerPacket, priority=2, decimate=4)
+
+        queue.fill(reader)
+        packet = queue.get()
+
+    :param int capacity: the number of packets the queue holds. Packets with
+      the ``KEEP`` policy may exceed it.
+    """
+
+    KEEP = 0
+    """Packets are never dropped."""
+    DROP_OLDEST = 1
+    """Packets may be dropped, oldest first, when the queue is full. This is the default."""
+    LATEST = 2
+    """Only the newest queued packet of this type is kept. A new packet replaces a queued
+    one in its place in the queue."""
+
+    def __init__(self, capacity: int = 32) -> None:
+        self.capacity = capacity
+        # (priority, policy, decimate) by packet type header.
+        self._policies: Dict[bytes, tuple] = {}
+        self._default_policy = (1, self.DROP_OLDEST, 1)
+        # Queued packets by priority, and the priorities in the order they are served.
+        self._queues: Dict[int, List[Packet]] = {}
+        self._priorities: List[int] = []
+        self._size = 0
+        # Packets received of each decimated type, by header.
+        self._received: Dict[bytes, int] = {}
+        self.drops: Dict[bytes, int] = {}
+        """Number of packets dropped, by packet type header, such as ``b"!A"``."""
+
+    def set_policy(
+        self,
+        packet_class: type,
+        priority: int = 1,
+        policy: int = DROP_OLDEST,
+        decimate: int = 1,
+    ) -> None:
+        """Set how packets of type ``packet_class`` are queued.
+
+        :param int priority: packets with lower priority numbers are returned first.
+          The default priority is 1.
+        :param int policy: ``KEEP``, ``DROP_OLDEST``, or ``LATEST``.
+        :param int decimate: queue only every ``decimate``-th packet of this type,
+          and drop the others.
+        """
+        if policy not in {self.KEEP, self.DROP_OLDEST, self.LATEST}:
+            raise ValueError("Unknown drop policy")
+        if decimate < 1:
+            raise ValueError("decimate must be at least 1")
+        self._policies[packet_class._TYPE_HEADER] = (priority, policy, decimate)
+
+    @property
+    def depth(self) -> int:
+        """The number of packets in the queue."""
+        return self._size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put(self, packet: Packet) -> bool:
+        """Add ``packet`` to the queue, following its type's policy.
+        Return ``False`` if the packet was dropped.
+        """
+        header = packet._TYPE_HEADER
+        priority, policy, decimate = self._policies.get(header, self._default_policy)
+
+        if decimate > 1:
+            received = self._received.get(header, 0)
+            self._received[header] = received + 1
+            if received % decimate:
+                self._count_drop(header)
+                return False
+
+        queue = self._queues.get(priority, None)
+        if queue is None:
+            queue = self._queues[priority] = []
+            self._priorities.append(priority)
+            self._priorities.sort()
+
+        if policy == self.LATEST:
+            for index, queued in enumerate(queue):
+                if queued._TYPE_HEADER == header:
+                    queue[index] = packet
+                    self._count_drop(header)
+                    return True
+
+        if self._size >= self.capacity and not self._evict(priority) and policy != self.KEEP:
+            self._count_drop(header)
+            return False
+
+        queue.append(packet)
+        self._size += 1
+        return True
+
+    def get(self) -> Optional[Packet]:
+        """Remove and return the most important packet in the queue,
+        or None if the queue is empty.
+        """
+        if not self._size:
+            return None
+        for priority in self._priorities:
+            queue = self._queues[priority]
+            if queue:
+                self._size -= 1
+                return queue.pop(0)
+        return None
+
+    def fill(self, reader: PacketReader) -> int:
+        """Queue all the packets available now from ``reader``.
+        Return the number of packets read. The reader must not reuse packet objects.
+        """
+        count = 0
+        while True:
+            packet = reader.read_packet()
+            if packet is None:
+                return count
+            self.put(packet)
+            count += 1
+
+    def _evict(self, priority: int) -> bool:
+        """Drop the oldest droppable packet with the largest priority number that is
+        at least ``priority``. Return ``False`` if there is none.
+        """
+        for queue_priority in reversed(self._priorities):
+            if queue_priority < priority:
+                break
+            queue = self._queues[queue_priority]
+            for index, queued in enumerate(queue):
+                header = queued._TYPE_HEADER
+                if self._policies.get(header, self._default_policy)[1] != self.KEEP:
+                    queue.pop(index)
+                    self._size -= 1
+                    self._count_drop(header)
+                    return True
+        return False
+
+    def _count_drop(self, header: bytes) -> None:
+        self.drops[header] = self.drops.get(header, 0) + 1
@@ -0,0 +1,317 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_bluefruit_connect.packet_reader`
+====================================================
+
+Buffered reader that cuts Bluefruit Connect App packets out of bulk reads.
+
+* Author(s): Adafruit Industries
+
+"""
+
+from __future__ import annotations
+
+import time
+
+from .packet import Packet
+
+try:
+    from io import RawIOBase
+    from typing import Any, Optional, Tuple  # adjust these as needed
+
+    from .link_stats import LinkStats
+except ImportError:
+    pass
+
+
+class PacketReader:
+    """Read packets from a stream using a few bulk reads instead of one read per byte.
+
+    Whatever the stream has waiting is read into a preallocated buffer, and packets
+    are cut out of that buffer. The packets returned are the same classes that
+    ``Packet.from_stream()`` returns.
+
+    Unlike ``Packet.from_stream()``, a corrupt packet does not raise an Error. When a
+    packet has an unregistered type, a bad checksum, or bad data, the reader scans
+    again from the byte after its b'!', so a valid packet that started inside the
+    corrupt one is not lost. The ``dropped_bytes`` and ``resyncs`` counters record
+    how often this happens.
+
+    :param stream stream: an input stream that provides ``in_waiting`` and ``readinto()``,
+      such as ``ble.UARTServer`` or ``busio.UART``. If ``None``, data is only
+      received through ``feed()``.
+    :param int buffer_size: size of the receive buffer, in bytes. It must be larger
+      than the longest packet. ValueError is raised if it is smaller than a packet
+      of a registered type. A packet of a type registered later that does not fit
+      is treated as corrupt.
+    :param bool reuse_packets: if ``True``, keep one packet object per packet type and
+      decode each new packet into it with ``Packet.parse_into()``, instead of creating
+      a new object each time. A returned packet is then only valid until the next packet
+      of the same type is read. ``RawTextPacket`` objects are never reused.
+    :param LinkStats stats: if given, a `LinkStats` object that is updated with what
+      the reader receives and how long decoding takes.
+    """
+
+    def __init__(
+        self,
+        stream: RawIOBase,
+        buffer_size: int = 256,
+        reuse_packets: bool = False,
+        stats: Optional[LinkStats] = None,
+    ) -> None:
+        longest = 2
+        for packet_class in Packet._type_to_class.values():
+            longest = max(longest, getattr(packet_class, "PACKET_LENGTH", 0))
+        if buffer_size < longest:
+            raise ValueError(f"buffer_size must be at least {longest}")
+        self._stream = stream
+        self.stats = stats
+        """The `LinkStats` being updated, or None."""
+        # Reusable packet objects, by packet class.
+        self._pool = {} if reuse_packets else None
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        # Data not yet consumed is in self._buffer[self._start:self._end].
+        self._start = 0
+        self._end = 0
+        # True after a bad packet, until the next good packet or newline.
+        self._resyncing = False
+        self.dropped_bytes = 0
+        """Number of received bytes that were discarded because they were not part of
+        a valid packet."""
+        self.resyncs = 0
+        """Number of times a bad packet made the reader scan again for a packet start."""
+
+    @property
+    def space(self) -> int:
+        """Number of bytes that ``feed()`` can currently accept."""
+        return len(self._buffer) - (self._end - self._start)
+
+    def feed(self, data: bytes) -> int:
+        """Add received data to the buffer, for data that does not come from ``stream``.
+        Return the number of bytes accepted, which is less than ``len(data)``
+        if the buffer does not have ``space`` for all of it.
+        """
+        self._compact()
+        count = min(len(data), len(self._buffer) - self._end)
+        self._view[self._end : self._end + count] = memoryview(data)[0:count]
+        self._end += count
+        if self.stats is not None:
+            self.stats.bytes_read += count
+        return count
+
+    def read_packet(self) -> Optional[Packet]:
+        """Return the next packet, or None if no complete packet is available yet.
+        Only the data the stream already has waiting is read, so this does not wait
+        for the stream's timeout. Corrupt packets are skipped.
+
+        If a packet of type "RT" (like ``RawTextPacket``) is registered, it will be
+        used to return a raw data line when no packet type was recognized.
+        """
+        stats = self.stats
+        while True:
+            frame = self._next_frame()
+            if frame is None:
+                return None
+            packet_class, length = frame
+            start = self._start
+            if packet_class._TYPE_HEADER == b"RT":
+                self._start += length
+                if stats is not None:
+                    stats.raw_text_lines += 1
+                return packet_class(bytes(self._view[start : start + length]))
+
+            if stats is not None:
+                decode_start = time.monotonic_ns()
+            if not self._checksum_ok(packet_class, start, length):
+                continue
+            try:
+                packet = self._decode(packet_class, start)
+            except ValueError:
+                self._malformed()
+                continue
+
+            self._start += length
+            self._resyncing = False
+            if stats is not None:
+                stats.record_packet(packet_class._TYPE_HEADER, time.monotonic_ns() - decode_start)
+            return packet
+
+    def _dispatch(self, handlers: list, raw: bytearray, text_handler: Any, text_raw: bool) -> int:
+        """Pass each available packet to ``handlers[type code]``, as ``read_packet()`` would
+        return it, or, if ``raw[type code]`` is set, as its unpacked field values.
+        Packets with no handler are skipped without being decoded.
+        Return the number of handlers called.
+        """
+        stats = self.stats
+        buffer = self._buffer
+        count = 0
+        while True:
+            frame = self._next_frame()
+            if frame is None:
+                return count
+            packet_class, length = frame
+            start = self._start
+            if packet_class._TYPE_HEADER == b"RT":
+                self._start += length
+                if stats is not None:
+                    stats.raw_text_lines += 1
+                if text_handler is not None:
+                    line = bytes(self._view[start : start + length])
+                    text_handler(line.strip() if text_raw else packet_class(line))
+                    count += 1
+                continue
+
+            code = buffer[start + 1]
+            handler = handlers[code]
+            if stats is not None:
+                decode_start = time.monotonic_ns()
+            if not self._checksum_ok(packet_class, start, length):
+                continue
+            if handler is None:
+                self._start += length
+                self._resyncing = False
+                if stats is not None:
+                    stats.record_undecoded_packet(packet_class._TYPE_HEADER)
+                continue
+            try:
+                if raw[code]:
+                    item = packet_class._unpack(buffer, start)
+                else:
+                    item = self._decode(packet_class, start)
+            except ValueError:
+                self._malformed()
+                continue
+
+            self._start += length
+            self._resyncing = False
+            if stats is not None:
+                stats.record_packet(packet_class._TYPE_HEADER, time.monotonic_ns() - decode_start)
+            if raw[code]:
+                handler(*item)
+            else:
+                handler(item)
+            count += 1
+
+    def _checksum_ok(self, packet_class: type, start: int, length: int) -> bool:
+        """Check the checksum of the packet at ``start``. If it is bad, count it and resync."""
+        try:
+            packet_class._verify_checksum_at(self._buffer, start, length)
+        except ValueError:
+            if self.stats is not None:
+                self.stats.bad_checksums += 1
+            self._resync()
+            return False
+        return True
+
+    def _malformed(self) -> None:
+        """Count a packet with a good checksum but bad data, and resync."""
+        if self.stats is not None:
+            self.stats.malformed_packets += 1
+        self._resync()
+
+    def _decode(self, packet_class: type, start: int) -> Packet:
+        """Decode the packet at ``start`` in place, without copying it out of the buffer.
+        The checksum has already been checked.
+        """
+        buffer = self._buffer
+        if self._pool is None:
+            return packet_class.parse_private(buffer, start)
+        packet = self._pool.get(packet_class, None)
+        if packet is None:
+            packet = self._pool[packet_class] = packet_class.parse_private(buffer, start)
+        else:
+            packet._load(buffer, start)
+        return packet
+
+    def _resync(self) -> None:
+        """Drop the b'!' at the start of a bad packet, to scan again from the next byte."""
+        self._start += 1
+        self.dropped_bytes += 1
+        self.resyncs += 1
+        self._resyncing = True
+        if self.stats is not None:
+            self.stats.skipped_bytes += 1
+            self.stats.resyncs += 1
+
+    def _next_frame(self) -> Optional[Tuple[type, int]]:
+        """Find the next complete frame, reading more data as needed.
+        Return ``(packet_class, length)`` for the frame at ``self._start``,
+        or None if a complete frame is not available yet.
+        """
+        buffer = self._buffer
+        raw_text_packet_cls = Packet._type_to_class.get(b"RT", None)
+        while True:
+            start = self._start
+            end = self._end
+            if start < end and buffer[start] != 0x21:
+                # Didn't find a packet start.
+                if raw_text_packet_cls and not self._resyncing:
+                    # Use an entire line for RawTextPacket.
+                    newline = buffer.find(b"\n", start, end)
+                    if newline >= 0:
+                        return raw_text_packet_cls, newline + 1 - start
+                    if start == 0 and end == len(buffer):
+                        # The buffer is full and has no newline: return what we have.
+                        return raw_text_packet_cls, end
+                else:
+                    # Skip to the next b'!', or discard everything.
+                    bang = buffer.find(b"!", start, end)
+                    skip_to = bang if bang >= 0 else end
+                    if self._resyncing:
+                        # The rest of a bad packet is not raw text, but a new line may be.
+                        newline = buffer.find(b"\n", start, skip_to)
+                        if newline >= 0:
+                            skip_to = newline + 1
+                            self._resyncing = False
+                    self.dropped_bytes += skip_to - start
+                    if self.stats is not None:
+                        self.stats.skipped_bytes += skip_to - start
+                    self._start = skip_to
+                    continue
+            elif end - start >= 2:
+                packet_class = Packet._class_for_code(buffer[start + 1])
+                if not packet_class:
+                    if self.stats is not None:
+                        self.stats.unregistered_headers += 1
+                    self._resync()
+                    continue
+                if packet_class.PACKET_LENGTH > len(buffer):
+                    # It could never be completed, and would stop all reading.
+                    self._resync()
+                    continue
+                if end - start >= packet_class.PACKET_LENGTH:
+                    return packet_class, packet_class.PACKET_LENGTH
+
+            if not self._fill():
+                return None
+
+    def _fill(self) -> bool:
+        """Read whatever the stream has waiting into the free part of the buffer.
+        Return True if anything was read.
+        """
+        self._compact()
+        if self._stream is None:
+            return False
+        waiting = self._stream.in_waiting
+        free = len(self._buffer) - self._end
+        if not waiting or not free:
+            return False
+        count = self._stream.readinto(self._view[self._end : self._end + min(waiting, free)])
+        if not count:
+            return False
+        self._end += count
+        if self.stats is not None:
+            self.stats.bytes_read += count
+        return True
+
+    def _compact(self) -> None:
+        """Move the unconsumed data to the front of the buffer."""
+        if self._start:
+            remaining = self._end - self._start
+            self._view[0:remaining] = self._view[self._start : self._end]
+            self._start = 0
+            self._end = remaining
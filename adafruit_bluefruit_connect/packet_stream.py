@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_bluefruit_connect.packet_stream`
+====================================================
+
+Read Bluefruit Connect App packets from an ``asyncio`` stream.
+
+* Author(s): Adafruit Industries
+
+"""
+
+from __future__ import annotations
+
+from .packet_reader import PacketReader
+
+try:
+    from typing import Any, Optional  # adjust these as needed
+
+    from .link_stats import LinkStats
+    from .packet import Packet
+except ImportError:
+    pass
+
+
+class PacketStream:
+    """Asynchronous counterpart of ``Packet.from_stream()``, for use in an ``asyncio``
+    event loop. Packets can be read one at a time with ``await stream.read_packet()``,
+    or iterated over with ``async for packet in stream:``.
+
+    Waiting for data yields control to the event loop, so other tasks keep running
+    while no packet is available. Packets are framed by a `PacketReader`, so corrupt
+    packets are skipped rather than raising an Error.
+
+    :param reader: an ``asyncio.StreamReader``-like object with an ``async read(n)``
+      method, which returns no data at the end of the stream.
+    :param int buffer_size: size of the receive buffer, in bytes. It must be larger
+      than the longest packet. As in `PacketReader`, ValueError is raised if it is
+      smaller than a packet of a registered type.
+    :param bool reuse_packets: reuse one packet object per packet type,
+      as in `PacketReader`.
+    :param LinkStats stats: if given, a `LinkStats` object to update, as in `PacketReader`.
+    """
+
+    def __init__(
+        self,
+        reader: Any,
+        buffer_size: int = 256,
+        reuse_packets: bool = False,
+        stats: Optional[LinkStats] = None,
+    ) -> None:
+        self._reader = reader
+        self.packet_reader = PacketReader(None, buffer_size, reuse_packets, stats)
+        """The `PacketReader` that frames the received data. Its counters describe the link."""
+
+    async def read_packet(self) -> Optional[Packet]:
+        """Return the next packet, waiting for more data as needed.
+        Return None when the stream has ended.
+
+        If a packet of type "RT" (like ``RawTextPacket``) is registered, it will be
+        used to return a raw data line when no packet type was recognized.
+        """
+        packet_reader = self.packet_reader
+        while True:
+            packet = packet_reader.read_packet()
+            if packet is not None:
+                return packet
+            space = packet_reader.space
+            if not space:
+                # read(0) would return no data, which would look like the end of the stream.
+                raise ValueError("Receive buffer is full")
+            data = await self._reader.read(space)
+            if not data:
+                return None
+            packet_reader.feed(data)
+
+    def __aiter__(self) -> PacketStream:
+        return self
+
+    async def __anext__(self) -> Packet:
+        packet = await self.read_packet()
+        if packet is None:
+            raise StopAsyncIteration
+        return packet
@@ -14,8 +14,6 @@ Bluefruit Connect App Quaternion data packet.
 
 from __future__ import annotations
 
-import struct
-
 from ._xyz_packet import _XYZPacket
 
 
@@ -24,9 +22,9 @@ class QuaternionPacket(_XYZPacket):
     from Accelerometer, Gyro, and Magnetometer readings."""
 
     # Use _XYZPacket to handle x, y, z, and add w.
+    __slots__ = ("_w",)
 
     _FMT_PARSE: str = "<xxffffx"
-    PACKET_LENGTH: int = struct.calcsize(_FMT_PARSE)
     # _FMT_CONSTRUCT doesn't include the trailing checksum byte.
     _FMT_CONSTRUCT: str = "<2sffff"
     _TYPE_HEADER: bytes = b"!Q"
@@ -36,12 +34,27 @@ class QuaternionPacket(_XYZPacket):
         super().__init__(x, y, z)
         self._w = w
 
-    def to_bytes(self) -> bytes:
-        """Return the bytes needed to send this packet."""
-        partial_packet = struct.pack(
-            self._FMT_CONSTRUCT, self._TYPE_HEADER, self._x, self._y, self._z, self._w
+    def _load(self, packet: bytes, offset: int = 0) -> None:
+        self._x, self._y, self._z, self._w = self._unpack(packet, offset)
+
+    def _values(self) -> tuple:
+        return self._x, self._y, self._z, self._w
+
+    def to_bytes_into(self, buffer: bytearray, offset: int = 0) -> int:
+        """Write the bytes needed to send this packet into ``buffer``, starting at ``offset``.
+        Return the offset just past the packet.
+        """
+        self._pack_into(
+            self._STRUCT_CONSTRUCT,
+            buffer,
+            offset,
+            self._TYPE_HEADER,
+            self._x,
+            self._y,
+            self._z,
+            self._w,
         )
-        return partial_packet + bytes((self.checksum(partial_packet),))
+        return self._add_checksum_into(buffer, offset)
 
     @property
     def w(self) -> float:
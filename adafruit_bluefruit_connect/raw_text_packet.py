@@ -30,6 +30,8 @@ from .packet import Packet
 class RawTextPacket(Packet):
     """A packet containing a text string."""
 
+    __slots__ = ("_text",)
+
     _TYPE_HEADER: bytes = b"RT"
 
     def __init__(self, text: str) -> None:
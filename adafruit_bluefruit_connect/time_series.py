@@ -0,0 +1,268 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_bluefruit_connect.time_series`
+====================================================
+
+Fixed-size history of sensor samples, stored in arrays, with statistics over
+the samples in the window that are updated as each sample is added.
+
+* Author(s): Adafruit Industries
+
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+from math import sqrt
+
+from ._xyz_packet import _XYZPacket
+
+try:
+    from typing import Optional  # adjust these as needed
+except ImportError:
+    pass
+
+
+class TimeSeries:
+    """The last ``size`` samples from an accelerometer, gyro, magnetometer, or
+    quaternion, with a timestamp for each. Samples are stored in one ``array('f')``
+    column per channel, plus a column holding the magnitude of each sample, so no
+    object is kept per sample. Once ``size`` samples have been added, each new
+    sample replaces the oldest one.
+
+    The sum and sum of squares of each column are updated as samples are added and
+    replaced, so `mean()` and `variance()` take constant time. For `minimum()` and
+    `maximum()`, each column also keeps the positions of the samples that may yet
+    become its minimum or maximum, in order, in a ring of positions. These are the
+    samples smaller (or larger) than every newer sample, so the minimum (or maximum)
+    is the oldest of them, and adding a sample takes constant time on average, even
+    when the values drift steadily up or down.
+
+    Statistics are asked for by channel: ``TimeSeries.X``, ``Y``, ``Z``, ``W`` (for
+    quaternions), or ``MAGNITUDE``::
+
+        accel = TimeSeries(50)
+        dispatcher.register(AccelerometerPacket, accel.append, raw=True)
+        ...
+        if accel.variance(TimeSeries.MAGNITUDE) > 4.0:
+            print("Shaking!")
+
+    :param int size: the number of samples kept.
+    :param int channels: 3 for x, y, and z samples, or 4 for quaternions.
+    """
+
+    X = 0
+    """The x channel."""
+    Y = 1
+    """The y channel."""
+    Z = 2
+    """The z channel."""
+    W = 3
+    """The w channel of a quaternion."""
+    MAGNITUDE = -1
+    """The magnitude of each sample: the square root of the sum of the squares
+    of its channels."""
+
+    def __init__(self, size: int, channels: int = 3) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        if channels not in {3, 4}:
+            raise ValueError("channels must be 3 or 4")
+        self.size = size
+        self.channels = channels
+        # One column per channel, followed by the magnitude column.
+        self._columns = [array("f", [0.0] * size) for _ in range(channels + 1)]
+        self._timestamps = array("L", [0] * size)
+        # Where the next sample goes, and the number of samples held.
+        self._next = 0
+        self._count = 0
+        # Samples replaced since the sums were last recomputed from the window.
+        self._replaced = 0
+        self._sums = [0.0] * (channels + 1)
+        self._squares = [0.0] * (channels + 1)
+        # For each column, rings of the positions of the samples that may become the
+        # minimum, and the maximum, oldest first: where each starts, and how many.
+        typecode = "H" if size <= 0x10000 else "L"
+        self._low_rings = [array(typecode, [0] * size) for _ in range(channels + 1)]
+        self._high_rings = [array(typecode, [0] * size) for _ in range(channels + 1)]
+        self._low_starts = [0] * (channels + 1)
+        self._low_lengths = [0] * (channels + 1)
+        self._high_starts = [0] * (channels + 1)
+        self._high_lengths = [0] * (channels + 1)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self) -> None:
+        """Remove all the samples."""
+        self._next = 0
+        self._count = 0
+        self._replaced = 0
+        for column in range(self.channels + 1):
+            self._sums[column] = 0.0
+            self._squares[column] = 0.0
+            self._low_lengths[column] = 0
+            self._high_lengths[column] = 0
+
+    def append(
+        self,
+        x: float,
+        y: float,
+        z: float,
+        w: Optional[float] = None,
+        *,
+        timestamp: Optional[int] = None,
+    ) -> None:
+        """Add a sample, replacing the oldest sample if the series is full.
+        It takes the values of an ``_XYZPacket`` or ``QuaternionPacket``, so it can be
+        registered as a raw handler with a `Dispatcher`.
+
+        :param float w: the w value, which must be given only if ``channels`` is 4.
+        :param int timestamp: when the sample was taken, in milliseconds.
+          Defaults to now, from ``time.monotonic_ns()``.
+        """
+        if (w is None) != (self.channels == 3):
+            raise ValueError(f"Expected {self.channels} values")
+        if timestamp is None:
+            timestamp = time.monotonic_ns() // 1000000
+        index = self._next
+        full = self._count == self.size
+        self._put(0, x, index, full)
+        self._put(1, y, index, full)
+        self._put(2, z, index, full)
+        if w is None:
+            self._put(-1, sqrt(x * x + y * y + z * z), index, full)
+        else:
+            self._put(3, w, index, full)
+            self._put(-1, sqrt(x * x + y * y + z * z + w * w), index, full)
+        self._timestamps[index] = timestamp & 0xFFFFFFFF
+        self._next = 0 if index + 1 == self.size else index + 1
+
+        if full:
+            # Recompute the sums now and then, so rounding errors from
+            # subtracting replaced samples do not build up.
+            self._replaced += 1
+            if self._replaced == self.size:
+                self._replaced = 0
+                self._resum()
+        else:
+            self._count += 1
+
+    def append_packet(self, packet: _XYZPacket, timestamp: Optional[int] = None) -> None:
+        """Add the values of an ``_XYZPacket``, such as an ``AccelerometerPacket``,
+        or of a ``QuaternionPacket``, as a sample.
+        """
+        if self.channels == 4:
+            self.append(packet.x, packet.y, packet.z, packet.w, timestamp=timestamp)
+        else:
+            self.append(packet.x, packet.y, packet.z, timestamp=timestamp)
+
+    def append_bytes(self, buffer: bytes, offset: int = 0, timestamp: Optional[int] = None) -> None:
+        """Add the values of the ``_XYZPacket`` or ``QuaternionPacket`` starting at
+        ``buffer[offset]`` as a sample, without creating a packet object. The packet is
+        validated as in ``Packet.from_bytes()``, and must be one of those types.
+        """
+        values = _XYZPacket.decode_raw(buffer, offset)
+        self.append(*values[1:], timestamp=timestamp)
+
+    def _put(self, column: int, value: float, index: int, full: bool) -> None:
+        values = self._columns[column]
+        if full:
+            old = values[index]
+            self._sums[column] -= old
+            self._squares[column] -= old * old
+        values[index] = value
+        # Use the value as stored, so the same value is subtracted when it is replaced.
+        value = values[index]
+        self._sums[column] += value
+        self._squares[column] += value * value
+
+        # Drop the replaced sample if it is the oldest in a ring, then the samples
+        # that are no smaller (or no larger) than the new one, and add the new one.
+        # Neither ring can hold a sample outside the window, so they never overflow.
+        size = self.size
+        ring = self._low_rings[column]
+        start = self._low_starts[column]
+        length = self._low_lengths[column]
+        if length and ring[start] == index:
+            start = 0 if start + 1 == size else start + 1
+            length -= 1
+        while length and values[ring[(start + length - 1) % size]] >= value:
+            length -= 1
+        ring[(start + length) % size] = index
+        self._low_starts[column] = start
+        self._low_lengths[column] = length + 1
+
+        ring = self._high_rings[column]
+        start = self._high_starts[column]
+        length = self._high_lengths[column]
+        if length and ring[start] == index:
+            start = 0 if start + 1 == size else start + 1
+            length -= 1
+        while length and values[ring[(start + length - 1) % size]] <= value:
+            length -= 1
+        ring[(start + length) % size] = index
+        self._high_starts[column] = start
+        self._high_lengths[column] = length + 1
+
+    def _resum(self) -> None:
+        for column, values in enumerate(self._columns):
+            total = 0.0
+            squares = 0.0
+            for value in values:
+                total += value
+                squares += value * value
+            self._sums[column] = total
+            self._squares[column] = squares
+
+    def _check_channel(self, channel: int) -> None:
+        # Only MAGNITUDE may be given as a negative index, and the magnitude column
+        # must not be reached as W when there are 3 channels.
+        if channel != self.MAGNITUDE and not 0 <= channel < self.channels:
+            raise ValueError("No such channel")
+
+    def _check_not_empty(self, channel: int) -> None:
+        self._check_channel(channel)
+        if not self._count:
+            raise ValueError("No samples")
+
+    def mean(self, channel: int) -> float:
+        """The mean of ``channel`` over the samples in the window."""
+        self._check_not_empty(channel)
+        return self._sums[channel] / self._count
+
+    def variance(self, channel: int) -> float:
+        """The population variance of ``channel`` over the samples in the window."""
+        self._check_not_empty(channel)
+        mean = self._sums[channel] / self._count
+        return max(self._squares[channel] / self._count - mean * mean, 0.0)
+
+    def minimum(self, channel: int) -> float:
+        """The smallest value of ``channel`` in the window."""
+        self._check_not_empty(channel)
+        return self._columns[channel][self._low_rings[channel][self._low_starts[channel]]]
+
+    def maximum(self, channel: int) -> float:
+        """The largest value of ``channel`` in the window."""
+        self._check_not_empty(channel)
+        return self._columns[channel][self._high_rings[channel][self._high_starts[channel]]]
+
+    def value(self, channel: int, age: int = 0) -> float:
+        """The value of ``channel`` in a sample. ``age`` 0 is the newest sample, 1 the one
+        before it, and so on.
+        """
+        self._check_channel(channel)
+        return self._columns[channel][self._index(age)]
+
+    def timestamp(self, age: int = 0) -> int:
+        """The timestamp, in milliseconds, of a sample. ``age`` is as in `value()`."""
+        return self._timestamps[self._index(age)]
+
+    def _index(self, age: int) -> int:
+        if not 0 <= age < self._count:
+            raise IndexError("No such sample")
+        return (self._next - 1 - age) % self.size
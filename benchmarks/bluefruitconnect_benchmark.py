@@ -0,0 +1,339 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+# SPDX-License-Identifier: MIT
+
+"""
+Benchmarks for packet decoding and encoding, stream framing, and image parsing.
+
+Runs on CPython, using an in-memory fake UART in place of a BLE connection.
+For each case it reports items (packets, lines, or image chunks) per second,
+bytes per second, and the peak memory in use while handling one item, above
+what was in use before it, as measured by ``tracemalloc``. This is the most
+memory an item needs at once, not a count of allocations: memory freed and
+allocated again while handling the item is only counted once. Throughput is
+compared with a stored baseline. Saving a baseline replaces the entries for
+the cases that were run, and keeps the others.
+
+Usage::
+
+    python benchmarks/bluefruitconnect_benchmark.py
+    python benchmarks/bluefruitconnect_benchmark.py --save-baseline
+    python benchmarks/bluefruitconnect_benchmark.py --filter image --save-baseline
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# ruff: noqa: E402
+from adafruit_bluefruit_connect.accelerometer_packet import AccelerometerPacket
+from adafruit_bluefruit_connect.button_packet import ButtonPacket
+from adafruit_bluefruit_connect.color_packet import ColorPacket
+from adafruit_bluefruit_connect.gyro_packet import GyroPacket
+from adafruit_bluefruit_connect.image_parser import BLEImageParser
+from adafruit_bluefruit_connect.location_packet import LocationPacket
+from adafruit_bluefruit_connect.magnetometer_packet import MagnetometerPacket
+from adafruit_bluefruit_connect.packet import Packet
+from adafruit_bluefruit_connect.packet_reader import PacketReader
+from adafruit_bluefruit_connect.quaternion_packet import QuaternionPacket
+from adafruit_bluefruit_connect.raw_text_packet import RawTextPacket
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+class FakeUART:
+    """An in-memory stream with the read operations of ``busio.UART`` and
+    ``UARTService``. Data is made available ``chunk_size`` bytes at a time,
+    like BLE notifications arriving.
+    """
+
+    def __init__(self, data, chunk_size=244):
+        self._bytes = bytes(data)
+        self._data = memoryview(self._bytes)
+        self._position = 0
+        self._chunk_size = chunk_size
+
+    @property
+    def in_waiting(self):
+        return min(self._chunk_size, len(self._data) - self._position)
+
+    def read(self, nbytes=None):
+        available = len(self._data) - self._position
+        count = available if nbytes is None else min(nbytes, available)
+        if not count:
+            return None
+        data = bytes(self._data[self._position : self._position + count])
+        self._position += count
+        return data
+
+    def readinto(self, buf, nbytes=None):
+        count = min(len(buf) if nbytes is None else nbytes, len(self._data) - self._position)
+        buf[0:count] = self._data[self._position : self._position + count]
+        self._position += count
+        return count
+
+    def readline(self):
+        end = self._bytes.find(b"\n", self._position)
+        end = len(self._data) if end < 0 else end + 1
+        data = bytes(self._data[self._position : end])
+        self._position = end
+        return data
+
+
+class Bitmap:
+    """A host stand-in for ``displayio.Bitmap`` with 16-bit values."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self._values = [0] * (width * height)
+
+    def __setitem__(self, index, value):
+        x, y = index
+        self._values[y * self.width + x] = value
+
+
+def sensor_flood(count=3000):
+    """Mixed accelerometer, gyro, magnetometer, quaternion, and location packets."""
+    rng = random.Random(1)
+    packets = []
+    for _ in range(count):
+        kind = rng.randrange(5)
+        values = [rng.uniform(-10, 10) for _ in range(4)]
+        if kind == 3:
+            packets.append(QuaternionPacket(*values))
+        elif kind == 4:
+            packets.append(LocationPacket(*values[:3]))
+        else:
+            packet_class = (AccelerometerPacket, GyroPacket, MagnetometerPacket)[kind]
+            packets.append(packet_class(*values[:3]))
+    return packets
+
+
+def control_pad(count=3000):
+    """Mostly button presses and releases, with occasional color picks."""
+    rng = random.Random(2)
+    packets = []
+    for i in range(count):
+        if i % 20 == 19:
+            packets.append(ColorPacket(rng.randrange(0x1000000)))
+        else:
+            packets.append(ButtonPacket(str(rng.randrange(1, 9)), i % 2 == 0))
+    return packets
+
+
+def raw_text(count=2000):
+    """Lines of text, as sent by the app's UART screen."""
+    return b"".join(f"line {i}: the quick brown fox\n".encode() for i in range(count))
+
+
+def image(width, height, color_space=16):
+    """An image in the app's image transfer format, RGB565 by default."""
+    pixels = bytes((i * 7) & 0xFF for i in range(width * height * color_space // 8))
+    header = b"!I" + bytes((color_space,))
+    data = header + width.to_bytes(2, "little") + height.to_bytes(2, "little") + pixels
+    return data + bytes((~sum(data) & 0xFF,))
+
+
+def encode(packets):
+    return b"".join(packet.to_bytes() for packet in packets)
+
+
+def iter_stream(data):
+    stream = FakeUART(data)
+    return iter(lambda: Packet.from_stream(stream), None)
+
+
+def iter_reader(data, reuse_packets=False):
+    reader = PacketReader(FakeUART(data), reuse_packets=reuse_packets)
+    return iter(reader.read_packet, None)
+
+
+def iter_from_bytes(data):
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        length = Packet._code_to_class[view[offset + 1]].PACKET_LENGTH
+        yield Packet.from_bytes(bytes(view[offset : offset + length]))
+        offset += length
+
+
+def iter_decode_raw(data):
+    offset = 0
+    while offset < len(data):
+        values = Packet.decode_raw(data, offset)
+        yield values
+        offset += Packet._code_to_class[values[0]].PACKET_LENGTH
+
+
+def iter_to_bytes(packets):
+    for packet in packets:
+        yield packet.to_bytes()
+
+
+def iter_encode_many(packets, mtu=244):
+    buffer = bytearray(mtu)
+    batch = []
+    size = 0
+    for packet in packets:
+        if size + packet.PACKET_LENGTH > mtu:
+            Packet.encode_many(batch, buffer)
+            batch.clear()
+            size = 0
+        batch.append(packet)
+        size += packet.PACKET_LENGTH
+        yield size
+    Packet.encode_many(batch, buffer)
+
+
+def iter_image(data, width, height, chunk_size, framebuffer=False, scale=1):
+    width //= scale
+    height //= scale
+    if framebuffer:
+        parser = BLEImageParser(None, framebuffer=bytearray(width * height * 2), scale=scale)
+    else:
+        parser = BLEImageParser(Bitmap(width, height), scale=scale)
+    view = memoryview(data)
+    for offset in range(0, len(view), chunk_size):
+        yield parser.add_chunk(view[offset : offset + chunk_size])
+
+
+def cases():
+    """Return ``(name, data size in bytes, function returning an iterator)`` for each case.
+    The iterator handles one item each time it is advanced.
+    """
+    flood = sensor_flood()
+    flood_data = encode(flood)
+    pad = control_pad()
+    pad_data = encode(pad)
+    text = raw_text()
+    result = [
+        ("sensor_flood/from_stream", flood_data, lambda: iter_stream(flood_data)),
+        ("sensor_flood/packet_reader", flood_data, lambda: iter_reader(flood_data)),
+        (
+            "sensor_flood/packet_reader_reuse",
+            flood_data,
+            lambda: iter_reader(flood_data, True),
+        ),
+        ("sensor_flood/iter_from_buffer", flood_data, lambda: Packet.iter_from_buffer(flood_data)),
+        ("sensor_flood/from_bytes", flood_data, lambda: iter_from_bytes(flood_data)),
+        ("sensor_flood/decode_raw", flood_data, lambda: iter_decode_raw(flood_data)),
+        ("sensor_flood/to_bytes", flood_data, lambda: iter_to_bytes(flood)),
+        ("control_pad/from_stream", pad_data, lambda: iter_stream(pad_data)),
+        ("control_pad/packet_reader", pad_data, lambda: iter_reader(pad_data)),
+        ("control_pad/from_bytes", pad_data, lambda: iter_from_bytes(pad_data)),
+        ("control_pad/decode_raw", pad_data, lambda: iter_decode_raw(pad_data)),
+        ("control_pad/to_bytes", pad_data, lambda: iter_to_bytes(pad)),
+        ("control_pad/encode_many", pad_data, lambda: iter_encode_many(pad)),
+        ("raw_text/from_stream", text, lambda: iter_stream(text)),
+        ("raw_text/packet_reader", text, lambda: iter_reader(text)),
+    ]
+    for size in (120, 240):
+        data = image(size, size)
+        for chunk_size in (20, 182, 244):
+            result.append(
+                (
+                    f"image_{size}x{size}/chunk_{chunk_size}",
+                    data,
+                    lambda data=data, size=size, chunk_size=chunk_size: iter_image(
+                        data, size, size, chunk_size
+                    ),
+                )
+            )
+        result.append(
+            (
+                f"image_{size}x{size}/framebuffer_244",
+                data,
+                lambda data=data, size=size: iter_image(data, size, size, 244, framebuffer=True),
+            )
+        )
+        result.append(
+            (
+                f"image_{size}x{size}/scale_2_244",
+                data,
+                lambda data=data, size=size: iter_image(data, size, size, 244, scale=2),
+            )
+        )
+        for name, color_space in (("indexed", 8), ("rgb888", 24)):
+            data = image(size, size, color_space)
+            result.append(
+                (
+                    f"image_{size}x{size}/{name}_244",
+                    data,
+                    lambda data=data, size=size: iter_image(data, size, size, 244),
+                )
+            )
+    return result
+
+
+def run_case(make_iterator, repeat):
+    """Return ``(items, best time in seconds, mean peak bytes in use per item)``."""
+    best = None
+    items = 0
+    for _ in range(repeat):
+        iterator = make_iterator()
+        start = time.perf_counter()
+        items = sum(1 for _ in iterator)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Allocation is measured separately, since tracing slows everything down.
+    iterator = make_iterator()
+    tracemalloc.start()
+    peaks = 0
+    for measured in range(min(items, 200)):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        next(iterator)
+        peaks += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return items, best, peaks / (measured + 1) if items else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file to compare with")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="save these results in the baseline, keeping the results of cases not run",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case; the best is used")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    args = parser.parse_args()
+
+    # Registering RawTextPacket makes non-packet lines come back as RawTextPackets.
+    RawTextPacket.register_packet_type()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    results = {}
+    print(f"{'case':40} {'items/s':>12} {'MB/s':>8} {'peak B/item':>13} {'vs baseline':>12}")
+    for name, data, make_iterator in cases():
+        if args.filter not in name:
+            continue
+        items, elapsed, peak = run_case(make_iterator, args.repeat)
+        rate = items / elapsed
+        results[name] = rate
+        throughput = len(data) / elapsed / 1e6
+        compared = f"{rate / baseline[name]:11.2f}x" if name in baseline else ""
+        print(f"{name:40} {rate:12.0f} {throughput:8.2f} {peak:13.0f} {compared:>12}")
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
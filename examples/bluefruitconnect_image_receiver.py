@@ -5,9 +5,11 @@
 Example for Playground Bluefruit + TFTGizmo that receives an image sent by the
 BLE Connect V2 mobile app.
 
+The image is shown band by band while it arrives.
+
 Current limitations:
  - Maximum size image is 120x120. Not enough RAM for bigger
- - 16bit 565 format only
+ - 16bit 565 and 24bit 888 formats only
 
 """
 
@@ -42,8 +44,14 @@ group.append(tile_grid)
 # Add the Group to the Display
 display.root_group = group
 
-# initialize image parser
-parser = BLEImageParser(bitmap)
+
+def show_rows(first_row, end_row):
+    # Only the part of the bitmap changed since the last refresh is redrawn.
+    display.refresh()
+
+
+# initialize image parser, refreshing the display every 16 rows received
+parser = BLEImageParser(bitmap, row_callback=show_rows, callback_rows=16)
 
 # set up BLE
 ble = BLERadio()
@@ -71,8 +79,8 @@ while True:
         if uart_server.in_waiting:
             raw_bytes = uart_server.read(uart_server.in_waiting)
             full_img_received = parser.add_chunk(raw_bytes)
-            if full_img_received:
-                display.refresh()
+            if full_img_received and not parser.checksum_ok:
+                print("Image checksum mismatch: image may be corrupt")
 
     # Disconnected
     print("DISCONNECTED")